@@ -31,7 +31,7 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 async def authenticate_user(email: str, password: str):
-    user = await users_collection.find_one({"email": email})
+    user = await users_collection.find_one({"email": email}, {"_id": 0, "email": 1, "password": 1})
     if not user:
         return False
     if not verify_password(password, user["password"]):
@@ -63,7 +63,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except jwt.PyJWTError:
         raise credentials_exception
         
-    user = await users_collection.find_one({"email": email})
+    # Routes never need the password hash - leave it on the server
+    user = await users_collection.find_one({"email": email}, {"password": 0})
     if user is None:
         raise credentials_exception
     return user
\ No newline at end of file
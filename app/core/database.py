@@ -4,4 +4,12 @@ from motor.motor_asyncio import AsyncIOMotorClient
 mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27055")
 client = AsyncIOMotorClient(mongo_uri)
 db = client["scanalyze"]
-users_collection = db["users"]
\ No newline at end of file
+users_collection = db["users"]
+chemical_mappings_collection = db["chemical_mappings"]
+
+
+async def ensure_indexes():
+    """Create MongoDB indexes required by the auth/profile routes and the mapping store."""
+    await users_collection.create_index("email", unique=True)
+    # TTL index - MongoDB removes stored mappings once expires_at has passed
+    await chemical_mappings_collection.create_index("expires_at", expireAfterSeconds=0)
@@ -1,7 +1,9 @@
+import asyncio
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 MYSQL_USER = os.getenv("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
@@ -11,17 +13,33 @@ MYSQL_DB = os.getenv("MYSQL_DB", "res_toxval_v96_2")
 
 DATABASE_URL = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
 
-engine = create_async_engine(DATABASE_URL, echo=False)
-async_session = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "20"))
+MYSQL_MAX_OVERFLOW = int(os.getenv("MYSQL_MAX_OVERFLOW", "10"))
+
+# Explicit async-aware pool: a plain QueuePool would block the event loop on checkout
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=MYSQL_POOL_SIZE,
+    max_overflow=MYSQL_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=1800,
 )
+async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 Base = declarative_base()
 
 async def get_db():
     """Dependency dla sesji bazy danych."""
     async with async_session() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+        yield session
+
+
+async def warm_up_pool(connections: int = 10):
+    """Open `connections` pooled connections up front so first requests skip the TCP+auth handshake."""
+    async def _ping():
+        async with async_session() as session:
+            await session.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(min(connections, MYSQL_POOL_SIZE))))
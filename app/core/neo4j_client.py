@@ -1,38 +1,67 @@
 import os
-from typing import Any, Dict, List, Optional
-from neo4j import AsyncGraphDatabase, GraphDatabase
+from typing import Any, Dict, List, Optional, Tuple
+from neo4j import AsyncGraphDatabase
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "scanalyze123")
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
 
 
 class Neo4jClient:
-    def __init__(self, uri: str = NEO4J_URI, user: str = NEO4J_USER, password: str = NEO4J_PASSWORD):
-        self._driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri: str = NEO4J_URI, user: str = NEO4J_USER, password: str = NEO4J_PASSWORD,
+                 database: str = NEO4J_DATABASE):
+        # Pinning the database skips the home-database lookup the driver otherwise does per session
+        self._database = database
+        self._driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+            connection_acquisition_timeout=10,
+        )
+
+    async def verify_connectivity(self):
+        """Open a pooled connection up front (fails fast if Neo4j is unreachable)."""
+        await self._driver.verify_connectivity()
 
     async def close(self):
         await self._driver.close()
 
     async def run(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        async with self._driver.session() as session:
+        async with self._driver.session(database=self._database) as session:
             result = await session.run(cypher, params or {})
             return [record.data() async for record in result]
 
+    async def run_single(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Run a query that returns at most one row; returns that row or None."""
+        async with self._driver.session(database=self._database) as session:
+            result = await session.run(cypher, params or {})
+            record = await result.single()
+            return record.data() if record else None
+
+    async def run_many(self, statements: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """Run several statements in a single write transaction (one session, one commit)."""
+        async def _work(tx):
+            results = []
+            for cypher, params in statements:
+                result = await tx.run(cypher, params or {})
+                results.append([record.data() async for record in result])
+            return results
+
+        async with self._driver.session(database=self._database) as session:
+            return await session.execute_write(_work)
+
 neo4j_client = Neo4jClient()
 
+CONSTRAINTS = [
+    "CREATE CONSTRAINT user_email IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
+    "CREATE CONSTRAINT cond_name IF NOT EXISTS FOR (c:Condition) REQUIRE c.name IS UNIQUE",
+    "CREATE CONSTRAINT product_id IF NOT EXISTS FOR (p:Product) REQUIRE p.id IS UNIQUE",
+    "CREATE CONSTRAINT ing_key IF NOT EXISTS FOR (i:Ingredient) REQUIRE i.key IS UNIQUE",
+    "CREATE CONSTRAINT effect_name IF NOT EXISTS FOR (e:Effect) REQUIRE e.name IS UNIQUE",
+]
+
 async def ensure_constraints():
-    """Create Neo4j constraints one by one (Neo4j doesn't support multiple in one statement)."""
-    constraints = [
-        "CREATE CONSTRAINT user_email IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
-        "CREATE CONSTRAINT cond_name IF NOT EXISTS FOR (c:Condition) REQUIRE c.name IS UNIQUE",
-        "CREATE CONSTRAINT product_id IF NOT EXISTS FOR (p:Product) REQUIRE p.id IS UNIQUE",
-        "CREATE CONSTRAINT ing_key IF NOT EXISTS FOR (i:Ingredient) REQUIRE i.key IS UNIQUE",
-        "CREATE CONSTRAINT effect_name IF NOT EXISTS FOR (e:Effect) REQUIRE e.name IS UNIQUE",
-    ]
-    for cypher in constraints:
-        try:
-            await neo4j_client.run(cypher)
-        except Exception as e:
-            # Constraint may already exist, ignore
-            pass
\ No newline at end of file
+    """Create Neo4j constraints - one statement each, all in a single transaction."""
+    await neo4j_client.run_many([(cypher, None) for cypher in CONSTRAINTS])
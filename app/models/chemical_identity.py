@@ -1,10 +1,12 @@
-from typing import Any, Optional, List, Dict
-from pydantic import BaseModel, Field
+from typing import Any, ClassVar, Optional, List, Dict, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
 class BasicChemicalIdentifiers(BaseModel):
-    """Core chemical idetifiers."""
+    """Core chemical identifiers."""
+    model_config = ConfigDict(frozen=True)
+
     inci_name: str
     cas_number: Optional[str] = None
     ec_number: Optional[str] = None
@@ -21,6 +23,8 @@ class BasicChemicalIdentifiers(BaseModel):
 
 class ToxicologyData(BaseModel):
     """Toxicological and safety data."""
+    model_config = ConfigDict(frozen=True)
+
     allergen_status: Optional[str] = None
     phototoxicity_risk: Optional[str] = None
     irritation_potential: Optional[str] = None
@@ -39,6 +43,8 @@ class ToxicologyData(BaseModel):
     
 class RegulatoryData(BaseModel):
     """Regulatory restrictions and compliance data."""
+    model_config = ConfigDict(frozen=True)
+
     eu_restrictions: Optional[List[str]] = None
     us_restrictions: Optional[List[str]] = None
     prohibited_categories: Optional[List[str]] = None
@@ -52,6 +58,8 @@ class RegulatoryData(BaseModel):
 
 class PhysicalChemicalData(BaseModel):
     """Physical and chemical properties."""
+    model_config = ConfigDict(frozen=True)
+
     solubility_water: Optional[str] = None
     solubility_oil: Optional[str] = None
     ph_value: Optional[float] = None
@@ -71,41 +79,41 @@ class ComprehensiveChemicalData(BaseModel):
     regulatory: Optional[RegulatoryData] = None
     physical_chemical: Optional[PhysicalChemicalData] = None
     
-    sources_used: List[str] = []
+    sources_used: List[str] = Field(default_factory=list)
     data_completeness: float = 0.0
     total_confidence: float = 0.0
     last_updated: datetime = Field(default_factory=datetime.now)
     
+    _DOMAIN_ATTRS: ClassVar[Tuple[str, ...]] = (
+        "basic_identifiers",
+        "toxicology",
+        "regulatory",
+        "physical_chemical",
+    )
+    
     def calculate_completeness(self):
-        """Calculate data completeness percentage."""
-        domains = [
-            self.basic_identifiers,
-            self.toxicology, 
-            self.regulatory,
-            self.physical_chemical
-        ]
-        filled_domains = sum(1 for domain in domains if domain is not None)
-        self.data_completeness = (filled_domains / len(domains)) * 100
+        """Calculate data completeness percentage and mean confidence in one pass."""
+        filled = 0
+        confidence_sum = 0.0
+        for name in self._DOMAIN_ATTRS:
+            domain = getattr(self, name)
+            if domain is not None:
+                filled += 1
+                confidence_sum += domain.confidence_score
         
-        confidences = []
-        if self.basic_identifiers:
-            confidences.append(self.basic_identifiers.confidence_score)
-        if self.toxicology:
-            confidences.append(self.toxicology.confidence_score)
-        if self.regulatory:
-            confidences.append(self.regulatory.confidence_score)
-        if self.physical_chemical:
-            confidences.append(self.physical_chemical.confidence_score)
-            
-        self.total_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        self.data_completeness = (filled / len(self._DOMAIN_ATTRS)) * 100
+        self.total_confidence = confidence_sum / filled if filled else 0.0
 
 
 class ChemicalIdentityResult(BaseModel):
     """Enhanced result with comprehensive data."""
+    # Shared between cache hits and repeated names in a batch, so it must not be mutated
+    model_config = ConfigDict(frozen=True)
+    
     inci_name: str
     comprehensive_data: Optional[ComprehensiveChemicalData] = None
-    sources_checked: List[str] = []
-    errors: List[str] = []
+    sources_checked: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
     found: bool = False
     processing_time_ms: float = 0.0
     
@@ -1,16 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..core.mysql_database import Base
 
 class Chemical(Base):
     __tablename__ = "chemical"
+    __table_args__ = (
+        Index("ix_chemical_name", "name", mysql_length=255),
+    )
     
     dtxsid = Column(String(45), primary_key=True)
-    casrn = Column(String(45))
+    casrn = Column(String(45), index=True)
     name = Column(Text)
     
 class Toxval(Base):
     __tablename__ = "toxval"
+    __table_args__ = (
+        Index("ix_toxval_dtxsid_type", "dtxsid", "toxval_type"),
+    )
     
     toxval_id = Column(Integer, primary_key=True, autoincrement=True)
     chemical_id = Column(String(45))
@@ -28,6 +34,10 @@ class Toxval(Base):
     
 class MvToxValDB(Base):
     __tablename__ = "mv_toxvaldb"
+    __table_args__ = (
+        Index("ix_mv_toxvaldb_dtxsid_type_route", "dtxsid", "toxval_type", "exposure_route"),
+        Index("ix_mv_toxvaldb_dtxsid_type_eco", "dtxsid", "toxval_type", "human_eco"),
+    )
     
     id = Column(Integer, primary_key=True)
     dtxsid = Column(String(255), index=True)
@@ -49,7 +59,7 @@ class MvSkinEye(Base):
     __tablename__ = "mv_skin_eye"
     
     id = Column(Integer, primary_key=True)
-    dtxsid = Column(String(255))
+    dtxsid = Column(String(255), index=True)
     endpoint = Column(String(45))
     classification = Column(String(255))
     result_text = Column(String(1024))
@@ -61,7 +71,7 @@ class MvCancerSummary(Base):
     __tablename__ = "mv_cancer_summary"
     
     id = Column(Integer, primary_key=True)
-    dtxsid = Column(String(255))
+    dtxsid = Column(String(255), index=True)
     source = Column(String(255))
     exposure_route = Column(String(255))
     cancer_call = Column(String(255))
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class UserIn(BaseModel):
     email: str
@@ -10,6 +10,8 @@ class UserOut(BaseModel):
 
 
 class UserProfileIn(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     # Physiological data
     age: Optional[int] = None
     gender: Optional[str] = None
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pymongo.errors import DuplicateKeyError
 
 from ..models.user import UserIn, UserOut
 from ..core.auth import authenticate_user, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
@@ -10,20 +11,20 @@ router = APIRouter()
 
 @router.post("/register", response_model=UserOut)
 async def register(user: UserIn):
-    existing = await users_collection.find_one({"email": user.email})
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Użytkownik o podanym adresie email już istnieje"
-        )
-    
     hashed_password = get_password_hash(user.password)
     user_data = {
         "email": user.email, 
         "password": hashed_password
     }
     
-    await users_collection.insert_one(user_data)
+    # Uniqueness is enforced by the unique index on "email" (see ensure_indexes)
+    try:
+        await users_collection.insert_one(user_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Użytkownik o podanym adresie email już istnieje"
+        )
     return {"email": user.email}
 
 @router.post("/login")
@@ -1,23 +1,26 @@
+import asyncio
 from datetime import datetime
+import hashlib
 import os
-import shutil
 import uuid
-import pytesseract
-import numpy as np
-import cv2
+from pathlib import Path
 from typing import List
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from app.service.decision_service import decide_product
-from app.service.neo4j_sync_service import upsert_ingredient_from_identity, upsert_product, upsert_user_profile, upsert_ingredient_with_hed
+from app.service.neo4j_sync_service import upsert_ingredient_from_identity, upsert_product, upsert_user_profile, upsert_ingredients_with_hed_batch
 from app.service.hed_integration_service import HEDIntegrationService
 from ..core.auth import get_current_user
-from ..core.database import users_collection
+from ..core.database import chemical_mappings_collection
 from ..core.neo4j_client import neo4j_client
 from ..service.ingredients_cleaner import IngredientsCleaner
+from ..service.ocr_service import decode_image, recognize
 from ..service.chemical_identity_mapper import ChemicalIdentityMapper
+from ..service.chemical_mapping_store import ChemicalMappingStore
 from ..prettier import save_analysis_results
+from ..utils.cache import LRUCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,10 +28,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/product", tags=["product"])
 UPLOAD_DIR = "uploads"
+# Dump mapping/decision payloads to JSON files (development only)
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 ingredientsCleaner = IngredientsCleaner()
-chemical_mapper = ChemicalIdentityMapper()
+chemical_mapper = ChemicalIdentityMapper(store=ChemicalMappingStore(chemical_mappings_collection))
+
+# OCR results keyed by image content hash - retried uploads of the same photo skip Tesseract
+ocr_cache = LRUCache(maxsize=256)
+# Mapping info per (ingredient set, body weight) - the decision is still computed per user
+product_cache = LRUCache(maxsize=256, ttl=3600)
+
+# User profile flag -> legacy Condition node name
+_CONDITION_MAP = (
+    ("sensitiveSkin", "sensitive_skin"),
+    ("hasAllergies", "allergies"),
+    ("acneVulgaris", "acne_vulgaris"),
+    ("psoriasis", "psoriasis"),
+    ("eczema", "eczema"),
+    ("rosacea", "rosacea"),
+)
+
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks = set()
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 class AnalyzeIngredientsRequest(BaseModel):
@@ -71,31 +101,35 @@ async def analyze_product_image(
             status_code=400,
             detail="Nieprawidłowy format pliku. Akceptowane są tylko obrazy."
         )
+    persist_task = None
     try:
         file_extension = image.filename.split(".")[-1] if "." in image.filename else "jpg"
         unique_filename = f"{uuid.uuid4()}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{file_extension}"
         file_path = os.path.join(UPLOAD_DIR, unique_filename)
         
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+        data = await image.read()
+        
+        # Persist the upload in a worker thread while the image is decoded and OCR'd from memory
+        persist_task = asyncio.create_task(asyncio.to_thread(Path(file_path).write_bytes, data))
             
-        print(f"Plik zapisany: {file_path}")
+        cache_key = hashlib.blake2b(data, digest_size=16).hexdigest()
+        cached = ocr_cache.get(cache_key)
+        if cached is not None:
+            extracted_text, ingredients = cached
+            ingredients = list(ingredients)
+        else:
+            img = await asyncio.to_thread(decode_image, data)
             
-        img = cv2.imread(file_path)
-        
-        # PROBABLY UNNECESSARY
-        # gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)    # grayscale conversion
-        # gray = cv2.GaussianBlur(gray, (5, 5), 0)        # Gaussian blur to reduce noise
-        # thresh = cv2.adaptiveThreshold(                 # Binary thresholding
-        #     gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-        #     cv2.THRESH_BINARY, 11, 2
-        # )
-        
-        
-        extracted_text = pytesseract.image_to_string(img, lang='eng+pol')
-        print(f" text: {extracted_text}")
+            # Downscaling happens inside the OCR service
+            extracted_text = await recognize(img)
+            logger.debug("OCR text length=%d", len(extracted_text))
+            
+            ingredients = ingredientsCleaner.extract_ingredients_from_text(extracted_text)
+            ocr_cache.set(cache_key, (extracted_text, tuple(ingredients)))
+        logger.debug("OCR cache hit ratio: %.2f (%d entries)", ocr_cache.hit_ratio, len(ocr_cache))
         
-        ingredients = ingredientsCleaner.extract_ingredients_from_text(extracted_text)
+        await persist_task
+        logger.debug("Plik zapisany: %s", file_path)
         
         return {
             "raw_text": extracted_text,
@@ -105,8 +139,10 @@ async def analyze_product_image(
         
        
     except Exception as e:
+        if persist_task is not None:
+            await asyncio.gather(persist_task, return_exceptions=True)
         if 'file_path' in locals() and os.path.exists(file_path):
-            os.remove(file_path)
+            await asyncio.to_thread(os.remove, file_path)
             
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -130,7 +166,8 @@ async def analyze_ingredients(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Brak potwierdzonych składników do analizy."
         )
-    user_profile = await users_collection.find_one({"email": current_user["email"]})
+    # get_current_user already loaded the full user document for this request
+    user_profile = current_user
     
     analyzed_ingredients = []
     
@@ -146,7 +183,128 @@ async def analyze_ingredients(
         "recommendation": recommendation
     }
     
-@router.post("/map-chemical-identities")
+async def _map_and_store_ingredients(ingredients: List[str], user_weight_kg: float):
+    """
+    Map ingredients, calculate HED and store ingredient data in Neo4j.
+    
+    Args:
+        ingredients: INCI names from the request
+        user_weight_kg: Body weight used for HED calculations
+    
+    Returns:
+        (ingredient keys, mapping info, whether the outcome is safe to cache)
+    """
+    logger.info(f"Mapping {len(ingredients)} ingredients with HED calculations")
+    mapping_results = await chemical_mapper.map_ingredients_batch(ingredients)
+    
+    hed_service = HEDIntegrationService(human_weight_kg=user_weight_kg)
+    logger.info(f"Using user weight: {user_weight_kg} kg for HED calculations")
+    
+    ing_keys = []
+    hed_summaries = []
+    hed_calculated_count = 0
+    
+    # Phase 1: HED math is CPU-bound - run it off the event loop, all ingredients at once
+    hed_candidates = [
+        r for r in mapping_results
+        if r.found and r.comprehensive_data and r.comprehensive_data.toxicology
+    ]
+    hed_outcomes = await asyncio.gather(
+        *(asyncio.to_thread(hed_service.process_ingredient_comprehensive_data, r.comprehensive_data.model_dump())
+          for r in hed_candidates),
+        return_exceptions=True
+    )
+    
+    neo4j_hed_by_name = {}
+    for r, hed_result in zip(hed_candidates, hed_outcomes):
+        if isinstance(hed_result, Exception):
+            logger.warning(f"HED calculation error for {r.inci_name}: {hed_result}")
+            hed_summaries.append({
+                "inci_name": r.inci_name,
+                "hed_calculated": False,
+                "reason": str(hed_result),
+            })
+            continue
+        
+        neo4j_hed_data = hed_result.get("neo4j_data")
+        neo4j_hed_by_name[r.inci_name] = neo4j_hed_data
+        
+        if hed_result.get("hed_calculated"):
+            hed_calculated_count += 1
+            logger.info(f"✓ HED calculated for {r.inci_name}: {neo4j_hed_data.get('safe_concentration_percent')}%")
+            
+            hed_summaries.append({
+                "inci_name": r.inci_name,
+                "hed_calculated": True,
+                "hed_mg_kg": neo4j_hed_data.get("hed_mg_kg"),
+                "safe_concentration_percent": neo4j_hed_data.get("safe_concentration_percent"),
+                "risk_assessment": neo4j_hed_data.get("risk_assessment"),
+                "recommendation": neo4j_hed_data.get("recommendation"),
+            })
+        else:
+            logger.info(f"○ HED not calculated for {r.inci_name}: {hed_result.get('reason')}")
+            hed_summaries.append({
+                "inci_name": r.inci_name,
+                "hed_calculated": False,
+                "reason": hed_result.get("reason"),
+            })
+    
+    # Phase 2: all mapped ingredients (with HED data, if available) in one batched Neo4j write.
+    # Cache hits skip these writes, so a failed write must keep the outcome out of the cache.
+    stored = True
+    try:
+        await upsert_ingredients_with_hed_batch(
+            [(r, neo4j_hed_by_name.get(r.inci_name)) for r in mapping_results]
+        )
+    except Exception as e:
+        stored = False
+        logger.error(f"Failed to store mapped ingredients in Neo4j: {e}")
+    
+    unmapped_rows = []
+    for r in mapping_results:
+        # Generate ingredient key
+        cd = r.comprehensive_data
+        key = (cd.basic_identifiers.inchi_key.lower() if cd and cd.basic_identifiers and cd.basic_identifiers.inchi_key
+               else f"cas:{cd.basic_identifiers.cas_number}" if cd and cd.basic_identifiers and cd.basic_identifiers.cas_number
+               else f"dtxsid:{cd.toxicology.dtxsid}" if cd and cd.toxicology and cd.toxicology.dtxsid
+               else f"inci:{r.inci_name.lower()}")
+        
+        # For unmapped ingredients, create basic Ingredient node with inci name
+        if not r.found or not cd:
+            unmapped_rows.append({"key": key, "inci_name": r.inci_name})
+        
+        ing_keys.append(key)
+    
+    if unmapped_rows:
+        try:
+            await neo4j_client.run("""
+            UNWIND $rows AS row
+            MERGE (i:Ingredient {key: row.key})
+            SET i.inci = row.inci_name
+            """, {"rows": unmapped_rows})
+        except Exception as e:
+            stored = False
+            logger.error(f"Failed to store unmapped ingredients in Neo4j: {e}")
+
+    # Calculate data coverage - prettier for testing
+    info = _create_info(mapping_results, ingredients)
+    
+    # Add HED summary to info
+    info["hed_summary"] = {
+        "total_ingredients": len(ingredients),
+        "hed_calculated": hed_calculated_count,
+        "hed_failed": len(ingredients) - hed_calculated_count,
+        "hed_details": hed_summaries,
+    }
+    
+    logger.info(f"Mapping complete: {len(mapping_results)} ingredients, {hed_calculated_count} with HED")
+    
+    # Transient source errors and failed ingredient writes must not be memoized for the whole product
+    cacheable = stored and not any(r.errors for r in mapping_results)
+    return ing_keys, info, cacheable
+
+
+@router.post("/map-chemical-identities", response_class=ORJSONResponse)
 async def map_chemical_identities(
     ingredients_data: dict,
     current_user: dict = Depends(get_current_user)
@@ -170,94 +328,29 @@ async def map_chemical_identities(
             detail="Brak składników do mapowania."
         )
     
-    logger.info(f"Mapping {len(ingredients)} ingredients with HED calculations")
-    mapping_results = await chemical_mapper.map_ingredients_batch(ingredients)
-    
-    user_profile = await users_collection.find_one({"email": current_user["email"]})
+    # get_current_user already loaded the full user document - reuse it for HED weight and conditions
+    user_profile = current_user
     user_weight_kg = user_profile.get("weight", 60.0) if user_profile else 60.0
     
-    hed_service = HEDIntegrationService(human_weight_kg=user_weight_kg)
-    logger.info(f"Using user weight: {user_weight_kg} kg for HED calculations")
-    
-    ing_keys = []
-    hed_summaries = []
-    hed_calculated_count = 0
+    # Re-uploads of the same product skip mapping, HED and ingredient writes entirely;
+    # HED depends on body weight, so it is part of the key. The cached info lists results
+    # in request order and spelling, so the key is the ingredient list exactly as sent.
+    cache_key = (tuple(ingredients), user_weight_kg)
+    cached = product_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Product cache hit for {len(ingredients)} ingredients")
+        ing_keys, info = cached
+    else:
+        ing_keys, info, cacheable = await _map_and_store_ingredients(ingredients, user_weight_kg)
+        if cacheable:
+            product_cache.set(cache_key, (ing_keys, info))
     
-    for r in mapping_results:
-        try:
-            # Calculate HED if toxicology data is available
-            neo4j_hed_data = None
-            if r.found and r.comprehensive_data and r.comprehensive_data.toxicology:
-                try:
-                    hed_result = hed_service.process_ingredient_comprehensive_data(
-                        r.comprehensive_data.dict()
-                    )
-                    neo4j_hed_data = hed_result.get("neo4j_data")
-                    
-                    if hed_result.get("hed_calculated"):
-                        hed_calculated_count += 1
-                        logger.info(f"✓ HED calculated for {r.inci_name}: {neo4j_hed_data.get('safe_concentration_percent')}%")
-                        
-                        # Add to summaries
-                        hed_summaries.append({
-                            "inci_name": r.inci_name,
-                            "hed_calculated": True,
-                            "hed_mg_kg": neo4j_hed_data.get("hed_mg_kg"),
-                            "safe_concentration_percent": neo4j_hed_data.get("safe_concentration_percent"),
-                            "risk_assessment": neo4j_hed_data.get("risk_assessment"),
-                            "recommendation": neo4j_hed_data.get("recommendation"),
-                        })
-                    else:
-                        logger.info(f"○ HED not calculated for {r.inci_name}: {hed_result.get('reason')}")
-                        hed_summaries.append({
-                            "inci_name": r.inci_name,
-                            "hed_calculated": False,
-                            "reason": hed_result.get("reason"),
-                        })
-                except Exception as hed_err:
-                    logger.warning(f"HED calculation error for {r.inci_name}: {hed_err}")
-                    hed_summaries.append({
-                        "inci_name": r.inci_name,
-                        "hed_calculated": False,
-                        "reason": str(hed_err),
-                    })
-            
-            # Upsert to Neo4j with HED data (if available)
-            await upsert_ingredient_with_hed(r, neo4j_hed_data)
-            
-            # Generate ingredient key
-            cd = r.comprehensive_data
-            key = (cd.basic_identifiers.inchi_key.lower() if cd and cd.basic_identifiers and cd.basic_identifiers.inchi_key
-                   else f"cas:{cd.basic_identifiers.cas_number}" if cd and cd.basic_identifiers and cd.basic_identifiers.cas_number
-                   else f"dtxsid:{cd.toxicology.dtxsid}" if cd and cd.toxicology and cd.toxicology.dtxsid
-                   else f"inci:{r.inci_name.lower()}")
-            
-            # For unmapped ingredients, create basic Ingredient node with inci name
-            if not r.found or not cd:
-                await neo4j_client.run("""
-                MERGE (i:Ingredient {key: $key})
-                SET i.inci = $inci_name
-                """, {"key": key, "inci_name": r.inci_name})
-            
-            ing_keys.append(key)
-        except Exception as e:
-            logger.error(f"Failed to process {r.inci_name}: {e}")
-
     product_id = f"tmp-{uuid.uuid4()}"
     await upsert_product(product_id, ing_keys)
 
     # Send full user profile to Neo4j for decision engine
-    user_profile = await users_collection.find_one({"email": current_user["email"]})
-    
     # Legacy conditions mapping (for backward compatibility with Condition nodes)
-    conditions = []
-    if user_profile:
-        if user_profile.get("sensitiveSkin"): conditions.append("sensitive_skin")
-        if user_profile.get("hasAllergies"): conditions.append("allergies")
-        if user_profile.get("acneVulgaris"): conditions.append("acne_vulgaris")
-        if user_profile.get("psoriasis"): conditions.append("psoriasis")
-        if user_profile.get("eczema"): conditions.append("eczema")
-        if user_profile.get("rosacea"): conditions.append("rosacea")
+    conditions = [name for flag, name in _CONDITION_MAP if user_profile.get(flag)] if user_profile else []
     
     # Upsert full profile to Neo4j (for advanced decision engine)
     await upsert_user_profile(
@@ -268,26 +361,15 @@ async def map_chemical_identities(
 
     decision = await decide_product(current_user["email"], product_id, preferred_routes=["dermal"])
 
-    # Calculate data coverage - prettier for testing
-    info = _create_info(mapping_results, ingredients)
-    
-    # Add HED summary to info
-    info["hed_summary"] = {
-        "total_ingredients": len(ingredients),
-        "hed_calculated": hed_calculated_count,
-        "hed_failed": len(ingredients) - hed_calculated_count,
-        "hed_details": hed_summaries,
-    }
-    
-    # TODO - save only in debug mode
-    save_analysis_results(info)
-    save_analysis_results(decision, prefix="decision_result")  # Save decision separately for debugging
+    if DEBUG:
+        # Fire-and-forget: the JSON dumps must not delay the response
+        _spawn(asyncio.to_thread(save_analysis_results, info))
+        _spawn(asyncio.to_thread(save_analysis_results, decision, prefix="decision_result"))  # Save decision separately for debugging
 
-    logger.info(f"Mapping complete: {len(mapping_results)} ingredients, {hed_calculated_count} with HED")
     return {"mapping": info, "decision": decision}
 
 
-@router.get("/ingredient/{inci_name}/hed")
+@router.get("/ingredient/{inci_name}/hed", response_class=ORJSONResponse)
 async def get_ingredient_hed(inci_name: str):
     """
     Get HED calculation for a single ingredient.
@@ -309,13 +391,12 @@ async def get_ingredient_hed(inci_name: str):
         raise HTTPException(status_code=404, detail=f"No data found for {inci_name}")
     
     # Calculate HED
-    hed_result = hed_service.process_ingredient_comprehensive_data(
-        result.comprehensive_data.dict()
-    )
+    comprehensive_data = result.comprehensive_data.model_dump()
+    hed_result = hed_service.process_ingredient_comprehensive_data(comprehensive_data)
     
     return {
         "inci_name": inci_name,
-        "comprehensive_data": result.comprehensive_data.dict(),
+        "comprehensive_data": comprehensive_data,
         "hed_analysis": hed_result,
     }
 
@@ -333,8 +414,8 @@ async def debug_neo4j_ingredient(inci_name: str):
     """
     from app.core.neo4j_client import neo4j_client
     
-    # Query all data for ingredient
-    result = await neo4j_client.run("""
+    # Query all data for ingredient - aggregated server-side into a single row
+    record = await neo4j_client.run_single("""
     MATCH (i:Ingredient)
     WHERE i.inci = $inci OR i.key CONTAINS $inci
     
@@ -348,15 +429,12 @@ async def debug_neo4j_ingredient(inci_name: str):
            collect(DISTINCT h) AS hazards,
            collect(DISTINCT e) AS effects,
            collect(DISTINCT hed) AS hed_assessments
+    LIMIT 1
     """, {"inci": inci_name.lower()})
     
-    records = [r async for r in result]
-    
-    if not records:
+    if record is None:
         raise HTTPException(status_code=404, detail=f"No Neo4j data found for {inci_name}")
     
-    record = records[0]
-    
     return {
         "inci_name": inci_name,
         "ingredient": dict(record["ingredient"]) if record["ingredient"] else None,
@@ -374,24 +452,20 @@ async def debug_neo4j_stats():
     """
     from app.core.neo4j_client import neo4j_client
     
-    # Count nodes by type
-    result = await neo4j_client.run("""
-    CALL db.labels() YIELD label
-    CALL apoc.cypher.run('MATCH (n:`' + label + '`) RETURN count(n) as count', {})
-    YIELD value
-    RETURN label, value.count AS count
-    ORDER BY value.count DESC
+    # Count nodes by type - read from APOC's count store instead of scanning each label
+    record = await neo4j_client.run_single("""
+    CALL apoc.meta.stats() YIELD labels
+    RETURN labels
     """, {})
     
-    stats = []
-    async for record in result:
-        stats.append({
-            "node_type": record["label"],
-            "count": record["count"]
-        })
+    label_counts = record["labels"] if record else {}
+    stats = [
+        {"node_type": label, "count": count}
+        for label, count in sorted(label_counts.items(), key=lambda item: item[1], reverse=True)
+    ]
     
     # Get HED assessments summary
-    hed_result = await neo4j_client.run("""
+    hed_stats = await neo4j_client.run_single("""
     MATCH (h:HEDAssessment)
     RETURN count(h) AS total_hed_assessments,
            avg(h.hed_mg_kg) AS avg_hed_mg_kg,
@@ -399,10 +473,6 @@ async def debug_neo4j_stats():
            collect(DISTINCT h.risk_assessment) AS risk_assessments
     """, {})
     
-    hed_stats = None
-    async for record in hed_result:
-        hed_stats = dict(record)
-    
     return {
         "node_counts": stats,
         "hed_summary": hed_stats,
@@ -410,43 +480,53 @@ async def debug_neo4j_stats():
 
 
 def _create_info(mapping_results, ingredients):
-    successful_mappings = [r for r in mapping_results if r.found]
-    failed_mappings = [r for r in mapping_results if not r.found]
-    
+    # Single pass over the results - every counter below is accumulated together
+    successful = 0
+    basic = toxicology = regulatory = physical = 0
     total_domains_available = 0
     domains_with_data = 0
+    total_ms = 0.0
+    sources = {}  # ordered set - keeps sources_used stable across processes and cache entries
     
-    for result in successful_mappings:
-        if result.comprehensive_data:
+    for r in mapping_results:
+        total_ms += r.processing_time_ms
+        cd = r.comprehensive_data
+        if r.found:
+            successful += 1
+        if not cd:
+            continue
+        
+        has_basic = cd.basic_identifiers is not None
+        has_tox = cd.toxicology is not None
+        has_reg = cd.regulatory is not None
+        has_phys = cd.physical_chemical is not None
+        basic += has_basic
+        toxicology += has_tox
+        regulatory += has_reg
+        physical += has_phys
+        sources.update(dict.fromkeys(cd.sources_used))
+        
+        if r.found:
             total_domains_available += 4  # 4 possible domains
-            if result.comprehensive_data.basic_identifiers:
-                domains_with_data += 1
-            if result.comprehensive_data.toxicology:
-                domains_with_data += 1
-            if result.comprehensive_data.regulatory:
-                domains_with_data += 1
-            if result.comprehensive_data.physical_chemical:
-                domains_with_data += 1
+            domains_with_data += has_basic + has_tox + has_reg + has_phys
     
     data_coverage = (domains_with_data / total_domains_available * 100) if total_domains_available > 0 else 0
     
     info = {
         "total_ingredients": len(ingredients),
-        "successful_mappings": len(successful_mappings),
-        "failed_mappings": len(failed_mappings),
-        "results": [r.dict() for r in mapping_results],
+        "successful_mappings": successful,
+        "failed_mappings": len(mapping_results) - successful,
+        "results": [r.model_dump() for r in mapping_results],
         "comprehensive_summary": {
-            "success_rate": len(successful_mappings) / len(ingredients) * 100,
+            "success_rate": successful / len(ingredients) * 100 if ingredients else 0,
             "data_coverage_percentage": data_coverage,
-            "avg_processing_time_ms": sum(r.processing_time_ms for r in mapping_results) / len(mapping_results),
-            "sources_used": list(set(source for r in mapping_results 
-                                   if r.comprehensive_data 
-                                   for source in r.comprehensive_data.sources_used)),
+            "avg_processing_time_ms": total_ms / len(mapping_results) if mapping_results else 0,
+            "sources_used": list(sources),
             "domains_summary": {
-                "basic_identifiers": sum(1 for r in mapping_results if r.comprehensive_data and r.comprehensive_data.basic_identifiers),
-                "toxicology": sum(1 for r in mapping_results if r.comprehensive_data and r.comprehensive_data.toxicology),
-                "regulatory": sum(1 for r in mapping_results if r.comprehensive_data and r.comprehensive_data.regulatory),
-                "physical_chemical": sum(1 for r in mapping_results if r.comprehensive_data and r.comprehensive_data.physical_chemical)
+                "basic_identifiers": basic,
+                "toxicology": toxicology,
+                "regulatory": regulatory,
+                "physical_chemical": physical
             }
         }
     }
@@ -1,13 +1,17 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from pymongo import ReturnDocument
 from ..models.user import UserProfileIn, UserProfileOut
 from ..core.auth import get_current_user
 from ..core.database import users_collection
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 @router.get("/profile", response_model=UserProfileOut)
 async def get_user_profile(current_user: dict = Depends(get_current_user)):
-    user = await users_collection.find_one({"email": current_user["email"]})
+    user = await users_collection.find_one({"email": current_user["email"]}, {"_id": 0, "password": 0})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -20,27 +24,27 @@ async def update_user_profile(
     profile: UserProfileIn,
     current_user: dict = Depends(get_current_user)
 ):
-    user = await users_collection.find_one({"email": current_user["email"]})
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Użytkownik nie znaleziony"
-        )
-    
     profile_dict = profile.model_dump()  # dict is deprecated, use model_dump()
     
+    # current_user is the stored document, so the bool coercion needs no extra read
     for key, value in profile_dict.items(): # TODO Check why doesnt see atopicSkin
         if value is None:
-            if key in user and isinstance(user[key], bool): # ? 
+            if key in current_user and isinstance(current_user[key], bool): # ? 
                 profile_dict[key] = False
             
     
-    # Aktualizacja dokumentu użytkownika
-    await users_collection.update_one(
+    # Aktualizacja dokumentu użytkownika - zapis i odczyt w jednym zapytaniu
+    updated_user = await users_collection.find_one_and_update(
         {"email": current_user["email"]},
-        {"$set": {**profile_dict}}
+        {"$set": {**profile_dict}},
+        projection={"_id": 0, "password": 0},
+        return_document=ReturnDocument.AFTER
     )
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Użytkownik nie znaleziony"
+        )
     
-    updated_user = await users_collection.find_one({"email": current_user["email"]})
-    print(f"Updated user: {updated_user}")
-    return updated_user
\ No newline at end of file
+    logger.debug("Updated profile for %s", current_user["email"])
+    return updated_user
@@ -1,26 +1,172 @@
 import abc
 import asyncio
+import functools
 import logging
-import httpx
-import time
+import os
+import aiohttp
+import orjson
 import random
-from typing import Any, Dict, List, Optional
-from fastapi import HTTPException
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..utils.bulkhead import Bulkhead
+from ..utils.cache import LRUCache
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Parsed lookup results, shared by all scraper instances. Ingredient names repeat
+# across products, so most lookups are answered without touching the network.
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "86400"))
+scrape_cache = LRUCache(maxsize=4096, ttl=SCRAPE_CACHE_TTL)
+
+
+# Lookups currently in progress; concurrent requests for the same key await these
+_inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+
+def _cache_key(scraper, method: str, query: str) -> Tuple[str, str, str]:
+    return (type(scraper).__name__, method, query.strip().lower())
+
+
+def cached_search(func):
+    """
+    Memoize a scraper's ``search_by_*`` method on (scraper, method, normalized query).
+
+    Results carrying an ``error`` are not cached, so transient failures are retried
+    on the next lookup; "not found" answers are cached like any other. Concurrent
+    calls for a key that is already being looked up wait for that lookup instead
+    of issuing their own; if that lookup is cancelled (e.g. its caller hit a
+    deadline), a waiting call takes it over rather than failing too.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, query: str) -> Dict[str, Any]:
+        key = _cache_key(self, func.__name__, query)
+        while True:
+            cached = scrape_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
+            pending = _inflight.get(key)
+            if pending is None:
+                break
+            try:
+                return dict(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this call itself was cancelled
+                # the leading call was cancelled; look up again (or follow a new leader)
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            result = await func(self, query)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; the caller re-raises it below
+            raise
+        finally:
+            _inflight.pop(key, None)
+
+        if not result.get("error"):
+            scrape_cache.set(key, dict(result))
+        future.set_result(result)
+        return result
+
+    return wrapper
+
+
+# One keep-alive connection pool shared by every scraper instance (scrapers are
+# created per lookup, so a per-instance client would never reuse a connection)
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use in the running loop."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=10, connect=5),
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session():
+    """Close the shared HTTP session (called on application shutdown)."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+@dataclass
+class ScrapeError:
+    """A failed upstream request. Returned (not raised) by ``_make_request`` so scrapers can degrade cheaply."""
+    status: int
+    detail: str
+
+
+# One token bucket per scraper class, shared by all of its instances
+_limiters: Dict[type, RateLimiter] = {}
+
+# Likewise one in-flight cap per scraper class
+_bulkheads: Dict[type, Bulkhead] = {}
+
+# Likewise one circuit breaker per scraper class (i.e. per upstream)
+BREAKER_FAIL_THRESHOLD = int(os.getenv("BREAKER_FAIL_THRESHOLD", "5"))
+BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+_breakers: Dict[type, CircuitBreaker] = {}
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 30.0
+
+
+def _backoff(attempt: int) -> float:
+    """Jittered exponential backoff: ~1s, 2s, 4s, ... capped at MAX_BACKOFF."""
+    return min(2 ** attempt, MAX_BACKOFF) + random.uniform(0.0, 1.0)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only), capped at MAX_BACKOFF."""
+    value = headers.get("Retry-After") if headers else None
+    try:
+        return min(float(value), MAX_BACKOFF) if value is not None else None
+    except ValueError:
+        return None
+
+
 class BaseScraper(abc.ABC):
     """Base abstract class for all scrapers."""
     
-    def __init__(self, rate_limit: float = 0.1):
+    def __init__(self, max_rate: float = 10.0, time_period: float = 1.0, max_retries: int = 3,
+                 max_concurrent: int = 10):
         """
-        Initialize the scraper with an optional rate limit.
+        Initialize the scraper with a rate limit and an in-flight cap.
+        
+        The limit is a token bucket shared by every instance of the same scraper
+        class (scrapers are created per lookup), allowing bursts of ``max_rate``
+        requests and ``max_rate`` requests per ``time_period`` seconds overall.
+        The in-flight cap (bulkhead) is shared the same way.
         
-        :param rate_limit: Minimum time in seconds between requests.
+        :param max_rate: Requests allowed per period (set to the API's real cap).
+        :param time_period: Period length in seconds.
+        :param max_retries: Retries for throttled (429), 5xx and connection failures.
+        :param max_concurrent: Requests allowed in flight at once (defaults to the per-host connection limit).
         """
-        self.rate_limit = rate_limit
-        self.last_request_time = 0.0
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0))
+        self.max_retries = max_retries
+        self.limiter = _limiters.setdefault(type(self), RateLimiter(max_rate, time_period))
+        self.bulkhead = _bulkheads.setdefault(type(self), Bulkhead(max_concurrent))
+        self.breaker = _breakers.setdefault(type(self), CircuitBreaker(BREAKER_FAIL_THRESHOLD, BREAKER_RECOVERY_TIMEOUT))
         
     async def __aenter__(self):
         return self
@@ -29,15 +175,15 @@ class BaseScraper(abc.ABC):
         await self.close()
         
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Release per-scraper resources; the shared HTTP session stays open for reuse."""
+        pass
         
     async def _make_request(self, url: str, method: str = 'GET', 
                             headers: Optional[Dict[str, str]] = None,
                             params: Optional[Dict[str, Any]] = None,
-                            json_data: Optional[Dict[str, Any]] = None) -> httpx.Response:
+                            json_data: Optional[Dict[str, Any]] = None) -> Union[Any, ScrapeError]:
         """
-        Make a rate-limited HTTP request.
+        Make a rate-limited HTTP request, retrying transient failures with backoff.
         
         Args:
             url: URL to request
@@ -47,33 +193,59 @@ class BaseScraper(abc.ABC):
             json_data: JSON data to send
             
         Returns:
-            HTTP response object
+            Decoded JSON response body, or a ScrapeError once retries are exhausted
+            or the response is a non-retryable HTTP error
         """
         
-        now = time.time()
-        elapsed = now - self.last_request_time
-        if elapsed < self.rate_limit:
-            delay = self.rate_limit - elapsed + random.uniform(0.1, 0.3)  # Add jitter
-            await asyncio.sleep(delay)
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
-        self.last_request_time = time.time()
+        if not self.breaker.allow_request():
+            return ScrapeError(status=503, detail=f"External API unavailable: {type(self).__name__} circuit open")
         
-        try:
-            if method.upper() == "GET":
-                response = await self.client.get(url, headers=headers, params=params)
-            elif method.upper() == "POST":
-                response = await self.client.post(url, headers=headers, params=params, json=json_data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self._send(method.upper(), url, headers, params, json_data)
+                self.breaker.record_success()
+                return result
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES:
+                    self.breaker.record_success()  # a 4xx answer means the upstream is up
+                    logger.error(f"HTTP error occurred: {e}")
+                    return ScrapeError(status=e.status, detail=f"External API error: {str(e)}")
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    logger.error(f"HTTP error occurred: {e}")
+                    return ScrapeError(status=e.status, detail=f"External API error: {str(e)}")
+                delay = _retry_after(e.headers) or _backoff(attempt)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    logger.error(f"Request error occurred: {e}")
+                    return ScrapeError(status=503, detail=f"External API unavailable: {str(e)}")
+                delay = _backoff(attempt)
+            except BaseException:
+                # Cancelled (e.g. a mapping deadline) or unexpected (e.g. an undecodable body):
+                # still report the outcome, or a half-open circuit would wait on it forever
+                self.breaker.record_failure()
+                raise
             
-            response.raise_for_status()
-            return response
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error occurred: {e}")
-            raise HTTPException(status_code=e.response.status_code, detail=f"External API error: {str(e)}")
-        except httpx.RequestError as e:
-            logger.error(f"Request error occurred: {e}")
-            raise HTTPException(status_code=503, detail=f"External API unavailable: {str(e)}")
+            logger.warning(f"Request to {url} failed, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+    
+    async def _send(self, method: str, url: str,
+                    headers: Optional[Dict[str, str]],
+                    params: Optional[Dict[str, Any]],
+                    json_data: Optional[Dict[str, Any]]) -> Any:
+        """Send a single rate-limited request and decode the JSON body."""
+        # Slot first, then token, so no token is spent while waiting for a slot
+        async with self.bulkhead, self.limiter:
+            async with get_session().request(
+                method, url, headers=headers, params=params,
+                json=json_data if method == "POST" else None
+            ) as response:
+                response.raise_for_status()
+                return orjson.loads(await response.read())
 
     @abc.abstractmethod
     async def search_by_name(self, name: str) -> Dict[str, Any]:
@@ -100,4 +272,54 @@ class BaseScraper(abc.ABC):
             Dictionary with ingredient data
         """
         pass
-    
\ No newline at end of file
+    
+    async def search_by_names(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Search for several ingredients by name at once.
+        
+        Names already in the scrape cache are answered from it; the rest go
+        through ``_search_many`` and are cached exactly as ``search_by_name``
+        results would be.
+        
+        Args:
+            names: Ingredient names to search
+            
+        Returns:
+            Dictionary mapping each name to its ingredient data
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        misses: List[str] = []
+        for name in dict.fromkeys(names):
+            cached = scrape_cache.get(_cache_key(self, "search_by_name", name))
+            if cached is not None:
+                results[name] = dict(cached)
+            else:
+                misses.append(name)
+        
+        if misses:
+            for name, result in (await self._search_many(misses)).items():
+                if not result.get("error"):
+                    scrape_cache.set(_cache_key(self, "search_by_name", name), dict(result))
+                results[name] = result
+        return results
+    
+    async def search_by_cas_numbers(self, cas_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Search for several ingredients by CAS number at once.
+        
+        Scrapers backed by a local database override this with a bulk query.
+        
+        Args:
+            cas_numbers: CAS numbers to search
+            
+        Returns:
+            Dictionary mapping each CAS number to its ingredient data
+        """
+        unique = list(dict.fromkeys(cas_numbers))
+        found = await asyncio.gather(*(self.search_by_cas(cas) for cas in unique))
+        return dict(zip(unique, found))
+    
+    async def _search_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up uncached names; scrapers with a batch endpoint override this."""
+        found = await asyncio.gather(*(self.search_by_name(name) for name in names))
+        return dict(zip(names, found))
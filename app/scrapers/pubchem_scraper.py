@@ -1,35 +1,69 @@
-from typing import Dict, Any
-import json
-from .base_scraper import BaseScraper
+from typing import Dict, Any, List, Union
+import asyncio
+import logging
+import re
+from functools import lru_cache
+from urllib.parse import quote
+from .base_scraper import BaseScraper, ScrapeError, cached_search
+
+logger = logging.getLogger(__name__)
+
+_CAS_RE = re.compile(r'\b\d{2,7}-\d{2}-\d\b')
+
+
+@lru_cache(maxsize=4096)
+def _q(name: str) -> str:
+    """URL-encode a compound name for a path segment; names with spaces, slashes or commas otherwise get a 400."""
+    return quote(name, safe='')
 
 class PubChemScraper(BaseScraper):
     """Scraper for PubChem database via REST API."""
     
     BASE_URL = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
     
+    # PubChem property name -> our field name
+    PROPERTIES = {
+        "MolecularFormula": "molecular_formula",
+        "MolecularWeight": "molecular_weight",
+        "CanonicalSMILES": "smiles",
+        "InChI": "inchi",
+        "InChIKey": "inchi_key"
+    }
+    PROPERTY_LIST = ",".join(PROPERTIES)
+    
     def __init__(self):
-        super().__init__(rate_limit=1.0)
+        # PubChem allows 5 requests per second; more than that in flight only earns 503s
+        super().__init__(max_rate=5, max_concurrent=5)
         
+    @cached_search
     async def search_by_name(self, name: str) -> Dict[str, Any]:
         """Search PubChem by compound name."""
-        cid_url = f"{self.BASE_URL}/compound/name/{name}/cids/JSON"
+        cid_url = f"{self.BASE_URL}/compound/name/{_q(name)}/cids/JSON"
         
         try:
-            response = await self._make_request(cid_url)
-            cid_data = response.json()
+            cid_data = await self._make_request(cid_url)
+            
+            if isinstance(cid_data, ScrapeError):
+                return self._error_result(cid_data, name)
             
             if not cid_data.get("IdentifierList", {}).get("CID"):
                 return {"source": "pubchem", "found": False, "inci_name": name}
                 
             cid = cid_data["IdentifierList"]["CID"][0]
             
-            properties = await self._get_properties_separately(cid)
-            synonyms_data = await self._get_synonyms(cid)
+            properties, synonyms_data = await asyncio.gather(
+                self._get_properties(cid),
+                self._get_synonyms(cid)
+            )
+            # A failed half would otherwise be cached as a partial or "not found" answer
+            for part in (properties, synonyms_data):
+                if isinstance(part, ScrapeError):
+                    return self._error_result(part, name)
             
             return self._parse_pubchem_data(properties, synonyms_data, name)
             
         except Exception as e:
-            print(e)
+            logger.error(f"Error in PubChemScraper.search_by_name: {str(e)}")
             return {
                 "source": "pubchem",
                 "found": False,
@@ -41,45 +75,98 @@ class PubChemScraper(BaseScraper):
         """Search PubChem by CAS number."""
         return await self.search_by_name(cas_number)
     
-    async def _get_properties_separately(self, cid: int) -> Dict[str, Any]:
-        """Get properties with separate API calls to avoid 400 errors."""
-        properties = {}
+    async def _get_properties(self, cid: int) -> Union[Dict[str, Any], ScrapeError]:
+        """Get all properties with one comma-separated property request; failures other than 404 are returned."""
+        prop_url = f"{self.BASE_URL}/compound/cid/{cid}/property/{self.PROPERTY_LIST}/JSON"
+        data = await self._make_request(prop_url)
+        if isinstance(data, ScrapeError):
+            return {} if data.status == 404 else data
         
-        property_endpoints = [
-            ("MolecularFormula", "molecular_formula"),
-            ("MolecularWeight", "molecular_weight"),
-            ("CanonicalSMILES", "smiles"),
-            ("InChI", "inchi"),
-            ("InChIKey", "inchi_key")
-        ]
-        
-        for pubchem_prop, our_prop in property_endpoints:
-            try:
-                prop_url = f"{self.BASE_URL}/compound/cid/{cid}/property/{pubchem_prop}/JSON"
-                response = await self._make_request(prop_url)
-                data = response.json()
-                
-                if data.get("PropertyTable", {}).get("Properties"):
-                    prop_value = data["PropertyTable"]["Properties"][0].get(pubchem_prop)
-                    if prop_value:
-                        properties[our_prop] = prop_value
-                        
-            except Exception as e:
-                #logger.warning(f"Failed to get {pubchem_prop} for CID {cid}: {e}")
-                continue
+        if not data.get("PropertyTable", {}).get("Properties"):
+            return {}
         
+        return self._to_property_table(data["PropertyTable"]["Properties"][0])
+    
+    def _to_property_table(self, prop: Dict[str, Any]) -> Dict[str, Any]:
+        """Rename one PubChem property row to our field names, wrapped as a PropertyTable."""
+        properties = {
+            our_prop: prop[pubchem_prop]
+            for pubchem_prop, our_prop in self.PROPERTIES.items()
+            if prop.get(pubchem_prop)
+        }
         return {"PropertyTable": {"Properties": [properties]}} if properties else {}
     
-    async def _get_synonyms(self, cid: int) -> Dict[str, Any]:
-        """Get synonyms separately."""
+    async def _get_synonyms(self, cid: int) -> Union[Dict[str, Any], ScrapeError]:
+        """Get synonyms separately; failures other than 404 are returned."""
+        synonyms_url = f"{self.BASE_URL}/compound/cid/{cid}/synonyms/JSON"
+        data = await self._make_request(synonyms_url)
+        if isinstance(data, ScrapeError):
+            return {} if data.status == 404 else data
+        return data
+
+    async def _search_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch lookup: one CID request per name, then a single property request and a
+        single synonyms request for all resolved CIDs (PUG-REST accepts comma-joined CIDs).
+        
+        Names cannot be batched the same way - the name namespace takes one name per request.
+        """
+        cid_responses = await asyncio.gather(
+            *(self._make_request(f"{self.BASE_URL}/compound/name/{_q(name)}/cids/JSON") for name in names),
+            return_exceptions=True
+        )
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        cids: Dict[str, int] = {}
+        for name, cid_data in zip(names, cid_responses):
+            if isinstance(cid_data, Exception):
+                results[name] = {"source": "pubchem", "found": False, "error": str(cid_data), "inci_name": name}
+            elif isinstance(cid_data, ScrapeError):
+                results[name] = self._error_result(cid_data, name)
+            elif not cid_data.get("IdentifierList", {}).get("CID"):
+                results[name] = {"source": "pubchem", "found": False, "inci_name": name}
+            else:
+                cids[name] = cid_data["IdentifierList"]["CID"][0]
+        
+        if not cids:
+            return results
+        
+        id_list = ",".join(str(cid) for cid in dict.fromkeys(cids.values()))
         try:
-            synonyms_url = f"{self.BASE_URL}/compound/cid/{cid}/synonyms/JSON"
-            response = await self._make_request(synonyms_url)
-            return response.json()
+            props_data, synonyms_data = await asyncio.gather(
+                self._make_request(f"{self.BASE_URL}/compound/cid/{id_list}/property/{self.PROPERTY_LIST}/JSON"),
+                self._make_request(f"{self.BASE_URL}/compound/cid/{id_list}/synonyms/JSON")
+            )
         except Exception as e:
-            #logger.warning(f"Failed to get synonyms for CID {cid}: {e}")
-            return {}
+            logger.error(f"Error in PubChemScraper._search_many: {str(e)}")
+            for name in cids:
+                results[name] = {"source": "pubchem", "found": False, "error": str(e), "inci_name": name}
+            return results
+        
+        for part in (props_data, synonyms_data):
+            if isinstance(part, ScrapeError) and part.status != 404:
+                for name in cids:
+                    results[name] = self._error_result(part, name)
+                return results
+        if isinstance(props_data, ScrapeError):
+            props_data = {}
+        if isinstance(synonyms_data, ScrapeError):
+            synonyms_data = {}
+        
+        props_by_cid = {row.get("CID"): row for row in props_data.get("PropertyTable", {}).get("Properties", [])}
+        synonyms_by_cid = {info.get("CID"): info for info in synonyms_data.get("InformationList", {}).get("Information", [])}
+        for name, cid in cids.items():
+            properties = self._to_property_table(props_by_cid.get(cid, {}))
+            synonyms = {"InformationList": {"Information": [synonyms_by_cid[cid]]}} if cid in synonyms_by_cid else {}
+            results[name] = self._parse_pubchem_data(properties, synonyms, name)
+        return results
 
+    def _error_result(self, error: ScrapeError, name: str) -> Dict[str, Any]:
+        """Result for a failed request; PubChem answers 404 for names it doesn't know."""
+        if error.status == 404:
+            return {"source": "pubchem", "found": False, "inci_name": name}
+        return {"source": "pubchem", "found": False, "error": error.detail, "inci_name": name}
+    
     def _parse_pubchem_data(self, properties: Dict, synonyms: Dict, search_term: str) -> Dict[str, Any]:
         """Parse PubChem API response - updated for new format."""
         result = {
@@ -105,11 +192,8 @@ class PubChemScraper(BaseScraper):
         # Parse CAS number from synonyms
         if synonyms.get("InformationList", {}).get("Information"):
             synonym_list = synonyms["InformationList"]["Information"][0].get("Synonym", [])
-            cas_pattern = r'\b\d{2,7}-\d{2}-\d\b'
-            
-            import re
             for synonym in synonym_list:
-                if re.match(cas_pattern, str(synonym)):
+                if _CAS_RE.match(str(synonym)):
                     result["cas_number"] = str(synonym)
                     result["found"] = True
                     break
@@ -1,51 +1,71 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+import asyncio
+import os
 import re
 import logging
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, _backoff, cached_search
+from ..utils.circuit_breaker import CircuitOpenError
 import pubchempy as pcp
 
 logger = logging.getLogger(__name__)
 
+# Both identifiers in one pattern; the middle group (2 vs 3 digits) keeps them disjoint
+_REGISTRY_FULL = re.compile(r'(?P<cas>\d{1,7}-\d{2}-\d)|(?P<ec>\d{3}-\d{3}-\d{1,2})').fullmatch
+# Longest possible CAS number: 7+2+1 digits and two hyphens
+_REGISTRY_MAX_LEN = 12
+
+
+def _registry_kind(text: str) -> Optional[str]:
+    """Return "cas", "ec" or None for a synonym; most names are rejected before the regex runs."""
+    if len(text) > _REGISTRY_MAX_LEN or '-' not in text:
+        return None
+    match = _REGISTRY_FULL(text)
+    return match.lastgroup if match else None
+
+# pubchempy is synchronous (urllib under the hood), so its calls run here instead
+# of on the event loop. Module-level because scrapers are created per lookup.
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pubchem")
+
+# Bounds each pubchempy call, both on the event loop (wait_for) and in its pool thread
+PUBCHEM_TIMEOUT = float(os.getenv("PUBCHEM_TIMEOUT", "10"))
+# Worth retrying: PubChem throttling/overload, our timeouts, network failures. Never 4xx.
+_TRANSIENT_ERRORS = (pcp.ServerBusyError, pcp.ServerError, pcp.TimeoutError, asyncio.TimeoutError,
+                     TimeoutError, URLError)
+
+
+def _urlopen(url, data=None, **kwargs):
+    """pubchempy's urlopen with a socket timeout, so a hung request gives its pool thread back."""
+    kwargs.setdefault("timeout", PUBCHEM_TIMEOUT)
+    return urlopen(url, data, **kwargs)
+
+# pubchempy calls urlopen without a timeout; wait_for alone would stop awaiting a
+# hung call but leave its thread blocked, and enough of those exhaust the pool
+pcp.urlopen = _urlopen
+
+# Fetched in one property-table request. ConnectivitySMILES is what PubChem now
+# returns for the legacy CanonicalSMILES (and what Compound.canonical_smiles reads).
+_PROPERTIES = ["ConnectivitySMILES", "InChI", "InChIKey", "MolecularFormula", "MolecularWeight", "IUPACName"]
+
 class PubChemScraperV2(BaseScraper):
     """Scraper for PubChem database using pubchempy library."""
     
     def __init__(self):
-        super().__init__(rate_limit=0.1)  # Can use faster rate with official library
+        # PubChem allows 5 requests per second; more than that in flight only earns 503s
+        super().__init__(max_rate=5, max_concurrent=5)
     
+    @cached_search
     async def search_by_name(self, name: str) -> Dict[str, Any]:
         """Search PubChem by compound name."""
         try:
-            compounds = pcp.get_compounds(name, 'name')
+            props, synonyms = await self._fetch_compound(name)
             
-            if not compounds:
+            if not props:
                 return {"source": "pubchem", "found": False, "inci_name": name}
             
-            compound = compounds[0]
-            
-            result = {
-                "source": "pubchem",
-                "found": True,
-                "inci_name": name,
-                "smiles": compound.canonical_smiles,
-                "inchi": compound.inchi,
-                "inchi_key": compound.inchikey,
-                "molecular_formula": compound.molecular_formula,
-                "molecular_weight": float(compound.molecular_weight) if compound.molecular_weight else None,
-                "confidence_score": 0.8  # Consistent with original scraper
-            }
-            
-            cas_number = self._extract_cas_number(compound.synonyms)
-            if cas_number:
-                result["cas_number"] = cas_number
-            
-            ec_number = self._extract_ec_number(compound.synonyms)
-            if ec_number:
-                result["ec_number"] = ec_number
-                
-            if hasattr(compound, 'iupac_name'):
-                result["systematic_name"] = compound.iupac_name
-            
-            return result
+            return self._name_result(name, props, synonyms)
             
         except Exception as e:
             logger.error(f"Error in PubChemScraperV2.search_by_name: {str(e)}")
@@ -56,37 +76,23 @@ class PubChemScraperV2(BaseScraper):
                 "inci_name": name
             }
     
+    @cached_search
     async def search_by_cas(self, cas_number: str) -> Dict[str, Any]:
         """Search PubChem by CAS number."""
         try:
-            compounds = pcp.get_compounds(cas_number, 'name')  # CAS works as a name search
+            props, synonyms = await self._fetch_compound(cas_number)  # CAS works as a name search
             
-            if not compounds:
+            if not props:
                 return {"source": "pubchem", "found": False, "cas_number": cas_number}
             
-            compound = compounds[0]
-            
-            result = {
-                "source": "pubchem",
-                "found": True,
-                "cas_number": cas_number,
-                "smiles": compound.canonical_smiles,
-                "inchi": compound.inchi,
-                "inchi_key": compound.inchikey,
-                "molecular_formula": compound.molecular_formula,
-                "molecular_weight": float(compound.molecular_weight) if compound.molecular_weight else None,
-                "confidence_score": 0.9  # Higher confidence since searching by CAS
-            }
+            result = self._build_result(props, confidence_score=0.9)  # Higher confidence since searching by CAS
+            result["cas_number"] = cas_number
             
-            if hasattr(compound, 'synonyms') and compound.synonyms:
-                possible_names = [s for s in compound.synonyms if not self._is_cas_number(s) and not self._is_ec_number(s)]
-                if possible_names:
-                    result["inci_name"] = possible_names[0]
+            inci_name = next((s for s in synonyms if not _registry_kind(s)), None)
+            if inci_name:
+                result["inci_name"] = inci_name
             
-            if hasattr(compound, 'iupac_name'):
-                result["systematic_name"] = compound.iupac_name
-                
-            ec_number = self._extract_ec_number(compound.synonyms)
+            _, ec_number = self._extract_registry_numbers(synonyms)
             if ec_number:
                 result["ec_number"] = ec_number
                 
@@ -101,32 +107,169 @@ class PubChemScraperV2(BaseScraper):
                 "cas_number": cas_number
             }
     
+    async def _fetch_compound(self, name: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Fetch the property table and synonyms of the first compound matching ``name``.
+        
+        Two light PUG-REST calls (instead of the full compound record plus a
+        synonyms call), sent in parallel on the pubchempy pool.
+        
+        Returns:
+            (properties of the first match or None, its synonyms)
+        """
+        props, synonyms = await asyncio.gather(
+            self._call(pcp.get_properties, _PROPERTIES, name, 'name'),
+            self._call(pcp.get_synonyms, name, 'name'),
+        )
+        if not props:
+            return None, []
+        
+        first = props[0]
+        # A name can resolve to several CIDs; use the synonyms of the same compound
+        info = next((i for i in synonyms if i.get("CID") == first.get("CID")), synonyms[0] if synonyms else {})
+        return first, info.get("Synonym", [])
+    
+    async def _search_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch lookup: one CID request per name (the name namespace takes a single
+        name), then one property request and one synonyms request for all CIDs.
+        """
+        cid_lists = await asyncio.gather(
+            *(self._call(pcp.get_cids, name, 'name') for name in names),
+            return_exceptions=True
+        )
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        cids: Dict[str, int] = {}
+        for name, found in zip(names, cid_lists):
+            if isinstance(found, Exception):
+                results[name] = {"source": "pubchem", "found": False, "error": str(found), "inci_name": name}
+            elif not found:
+                results[name] = {"source": "pubchem", "found": False, "inci_name": name}
+            else:
+                cids[name] = found[0]
+        
+        if not cids:
+            return results
+        
+        unique_cids = list(dict.fromkeys(cids.values()))
+        try:
+            props, synonyms = await asyncio.gather(
+                self._call(pcp.get_properties, _PROPERTIES, unique_cids, 'cid'),
+                self._call(pcp.get_synonyms, unique_cids, 'cid'),
+            )
+        except Exception as e:
+            logger.error(f"Error in PubChemScraperV2._search_many: {str(e)}")
+            for name in cids:
+                results[name] = {"source": "pubchem", "found": False, "error": str(e), "inci_name": name}
+            return results
+        
+        props_by_cid = {row.get("CID"): row for row in props}
+        synonyms_by_cid = {info.get("CID"): info.get("Synonym", []) for info in synonyms}
+        for name, cid in cids.items():
+            if cid in props_by_cid:
+                results[name] = self._name_result(name, props_by_cid[cid], synonyms_by_cid.get(cid, []))
+            else:
+                results[name] = {"source": "pubchem", "found": False, "inci_name": name}
+        return results
+    
+    async def _call(self, func, *args):
+        """
+        Run a blocking pubchempy call on the pool, rate limited, capped in flight, bounded by
+        PUBCHEM_TIMEOUT and retried with jittered backoff on transient failures.
+        Fails fast with CircuitOpenError while PubChem's circuit is open.
+        
+        Args:
+            func: pubchempy function to call
+            *args: Its positional arguments
+            
+        Returns:
+            Whatever ``func`` returns
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("PubChem circuit open")
+        
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.bulkhead:
+                    await self.limiter.acquire()
+                    result = await asyncio.wait_for(loop.run_in_executor(_pool, func, *args), PUBCHEM_TIMEOUT)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                delay = _backoff(attempt)
+                logger.warning(f"PubChem {func.__name__} failed ({e!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except pcp.PubChemHTTPError:
+                self.breaker.record_success()  # e.g. BadRequest - PubChem itself answered
+                raise
+            except BaseException:
+                # Cancelled (e.g. a mapping deadline) or unexpected: still report the
+                # outcome, or a half-open circuit would wait on it forever
+                self.breaker.record_failure()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+    
+    def _name_result(self, name: str, props: Dict[str, Any], synonyms: List[str]) -> Dict[str, Any]:
+        """Build a search_by_name result from a property row and synonyms."""
+        result = self._build_result(props, confidence_score=0.8)  # Consistent with original scraper
+        result["inci_name"] = name
+        
+        cas_number, ec_number = self._extract_registry_numbers(synonyms)
+        if cas_number:
+            result["cas_number"] = cas_number
+        
+        if ec_number:
+            result["ec_number"] = ec_number
+        
+        return result
+    
+    def _build_result(self, props: Dict[str, Any], confidence_score: float) -> Dict[str, Any]:
+        """Map a PubChem property row onto our result fields."""
+        molecular_weight = props.get("MolecularWeight")
+        return {
+            "source": "pubchem",
+            "found": True,
+            "smiles": props.get("ConnectivitySMILES"),
+            "inchi": props.get("InChI"),
+            "inchi_key": props.get("InChIKey"),
+            "molecular_formula": props.get("MolecularFormula"),
+            "molecular_weight": float(molecular_weight) if molecular_weight else None,
+            "systematic_name": props.get("IUPACName"),
+            "confidence_score": confidence_score
+        }
+    
     def _is_cas_number(self, text: str) -> bool:
         """Check if a string matches CAS number pattern."""
-        return bool(re.match(r'^\d{1,7}-\d{2}-\d$', text))
+        return _registry_kind(text) == "cas"
     
     def _is_ec_number(self, text: str) -> bool:
         """Check if a string matches EC number pattern."""
-        return bool(re.match(r'^\d{3}-\d{3}-\d{1,2}$', text))
+        return _registry_kind(text) == "ec"
     
     def _extract_cas_number(self, synonyms: List[str]) -> Optional[str]:
         """Extract CAS number from a list of synonyms."""
-        if not synonyms:
-            return None
-            
-        for synonym in synonyms:
-            if self._is_cas_number(synonym):
-                return synonym
-                
-        return None
+        return self._extract_registry_numbers(synonyms)[0]
+        
+    def _extract_registry_numbers(self, synonyms: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Extract the first CAS and EC numbers from a list of synonyms in a single pass."""
+        cas_number = ec_number = None
+        for synonym in synonyms or []:
+            kind = _registry_kind(synonym)
+            if kind == "cas" and cas_number is None:
+                cas_number = synonym
+            elif kind == "ec" and ec_number is None:
+                ec_number = synonym
+            else:
+                continue
+            if cas_number and ec_number:
+                break
+        return cas_number, ec_number
         
     def _extract_ec_number(self, synonyms: List[str]) -> Optional[str]:
         """Extract EC number from a list of synonyms."""
-        if not synonyms:
-            return None
-            
-        for synonym in synonyms:
-            if self._is_ec_number(synonym):
-                return synonym
-                
-        return None
\ No newline at end of file
+        return self._extract_registry_numbers(synonyms)[1]
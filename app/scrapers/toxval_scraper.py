@@ -1,37 +1,61 @@
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+import os
+import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.mysql_database import async_session
-from ..service.toxval_service import ToxValService
+from ..service.toxval_service import Bundle, ToxValDBRow, ToxValService
+from ..utils.cache import LRUCache
 from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
+# ToxVal is a static local snapshot; the TTL only bounds staleness after a reload
+TOXVAL_CACHE_TTL = int(os.getenv("TOXVAL_CACHE_TTL", "3600"))
+
+# DTXSID -> toxicology result dict
+toxicity_cache = LRUCache(maxsize=4096, ttl=TOXVAL_CACHE_TTL)
+
+# Value types that count as a safe exposure level (matched as substrings of toxval_type)
+SAFETY_VALUE_TYPES = ('ADI', 'TDI', 'RfD', 'DNEL', 'PNEC', 'MRL')
+_SAFETY_TYPE_RE = re.compile("|".join(SAFETY_VALUE_TYPES))
+
+# Keyword matchers for the extractors; case-insensitive so rows needn't be lower-cased first
+_SKIN_SENS_RE = re.compile(r"skin sens", re.I)
+_NOT_SENSITISING_RE = re.compile(r"not sensitising|non-sensitising", re.I)
+_SENSITISING_RE = re.compile(r"sensiti[sz]ing", re.I)
+_ALLERGEN_RE = re.compile(r"allergen|allergic", re.I)
+# Measured absorption (reported as a percentage) vs. a looser absorption estimate
+_ABSORPTION_RE = re.compile(r"absorption|penetration|permeab", re.I)
+_ABSORB_RE = re.compile(r"absorb|bioavailab", re.I)
+_DERMAL_RE = re.compile(r"dermal|cutaneous", re.I)
+_SKIN_ROUTE_RE = re.compile(r"dermal|cutaneous|skin", re.I)
+
 class ToxValScraper(BaseScraper):
     """Scraper for the local MySQL ToxVal database."""
     
     def __init__(self):
         super().__init__()
         self.service = ToxValService()
-        self.db = None
     
-    async def __aenter__(self):
-        """Enter the asynchronous context and initialize the database session."""
-        logger.debug("Initializing ToxValScraper database session")
-        self.db = async_session()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Exit the asynchronous context and close the database session."""
-        logger.debug("Closing ToxValScraper database session")
-        if self.db:
-            await self.db.close()
+    @asynccontextmanager
+    async def _session(self):
+        """
+        Yield a session from the engine's pool for one query.
+        
+        Every lookup gets its own: an AsyncSession is not concurrency-safe, and
+        sharing one across a batch would serialize the batch's ToxVal queries.
+        """
+        async with async_session() as db:
+            yield db
     
-    async def search_by_name(self, name: str) -> Dict[str, Any]: #DRY
+    async def search_by_name(self, name: str) -> Dict[str, Any]:
         """Search by INCI name."""
         logger.info(f"ToxValScraper: searching by name: {name}")
         try:
-            chemicals = await self.service.find_chemical_by_name(self.db, name)
+            async with self._session() as db:
+                chemicals = await self.service.find_chemical_by_name(db, name)
             
             if not chemicals or len(chemicals) == 0:
                 logger.info(f"ToxValScraper: No match found for name: {name}")
@@ -42,42 +66,20 @@ class ToxValScraper(BaseScraper):
             
             logger.info(f"ToxValScraper: Found match for {name}: {chemical['name']} ({chemical['casrn']}, {dtxsid})")
             
-            skin_eye = await self.service.get_skin_eye_data(self.db, dtxsid)
-            cancer = await self.service.get_cancer_data(self.db, dtxsid)
-            dermal = await self.service.get_dermal_toxicity(self.db, dtxsid)
-            
-            toxvaldb_data = await self.service.get_toxvaldb_data(self.db, dtxsid=dtxsid)
-            
-            noael_value = self._extract_noael_from_toxvaldb(toxvaldb_data) or self._extract_noael(dermal)
-            
-            result = {
-                "found": True,
-                "dtxsid": dtxsid,
-                "irritation_potential": self._extract_irritation(skin_eye),
-                "sensitization_risk": self._extract_sensitization(skin_eye),
-                "allergen_status": self._extract_allergen_status(skin_eye),
-                "carcinogenicity": self._extract_carcinogenicity(cancer),
-                "noael_value": noael_value,
-                "dermal_toxicity_values": self._extract_toxicity_values_from_toxvaldb(toxvaldb_data),
-                "toxicological_effects": self._extract_effects_from_toxvaldb(toxvaldb_data),
-                "safe_concentration": self._extract_safe_concentration(toxvaldb_data),
-                "dermal_absorption": self._extract_dermal_absorption(toxvaldb_data),
-                "source": "toxval",
-                "confidence_score": 0.8
-            }
-            
-            logger.debug(f"ToxValScraper results for name {name}: {result}")
+            result = await self._fetch_bundle_for_dtxsid(dtxsid)
+            logger.debug("ToxValScraper results for name %s: %s", name, result)
             return result
             
         except Exception as e:
             logger.warning(f"Toxicology data failed for toxval: {e}")
-            return {"found": False}
+            return {"found": False, "error": str(e)}
     
-    async def search_by_cas(self, cas_number: str) -> Dict[str, Any]: # DRY
+    async def search_by_cas(self, cas_number: str) -> Dict[str, Any]:
         """Search by CAS number."""
         logger.info(f"ToxValScraper: searching by CAS: {cas_number}")
         try:
-            chemical = await self.service.find_chemical_by_cas(self.db, cas_number)
+            async with self._session() as db:
+                chemical = await self.service.find_chemical_by_cas(db, cas_number)
             
             if not chemical:
                 logger.info(f"ToxValScraper: No match found for CAS: {cas_number}")
@@ -87,129 +89,216 @@ class ToxValScraper(BaseScraper):
             
             logger.info(f"ToxValScraper: Found match for CAS {cas_number}: {chemical['name']} ({dtxsid})")
             
-            # Collect data from different tables
-            skin_eye = await self.service.get_skin_eye_data(self.db, dtxsid)
-            cancer = await self.service.get_cancer_data(self.db, dtxsid)
-            dermal = await self.service.get_dermal_toxicity(self.db, dtxsid)
-            
-            toxvaldb_data = await self.service.get_toxvaldb_data(self.db, dtxsid=dtxsid)
-            
-            noael_value = self._extract_noael_from_toxvaldb(toxvaldb_data) or self._extract_noael(dermal)
-            
-            result = {
-                "found": True,
-                "dtxsid": dtxsid,
-                "irritation_potential": self._extract_irritation(skin_eye),
-                "sensitization_risk": self._extract_sensitization(skin_eye),
-                "allergen_status": self._extract_allergen_status(skin_eye),
-                "carcinogenicity": self._extract_carcinogenicity(cancer),
-                "noael_value": noael_value,
-                "dermal_toxicity_values": self._extract_toxicity_values_from_toxvaldb(toxvaldb_data),
-                "toxicological_effects": self._extract_effects_from_toxvaldb(toxvaldb_data),
-                "safe_concentration": self._extract_safe_concentration(toxvaldb_data),
-                "dermal_absorption": self._extract_dermal_absorption(toxvaldb_data),
-                "source": "toxval",
-                "confidence_score": 0.8
-            }
-            
-            logger.debug(f"ToxValScraper results for CAS {cas_number}: {result}")
+            result = await self._fetch_bundle_for_dtxsid(dtxsid)
+            logger.debug("ToxValScraper results for CAS %s: %s", cas_number, result)
             return result
             
         except Exception as e:
             logger.warning(f"Toxicology data failed for toxval: {e}")
-            return {"found": False}
+            return {"found": False, "error": str(e)}
     
+    async def _fetch_bundle_for_dtxsid(self, dtxsid: str) -> Dict[str, Any]:
+        """
+        Build the toxicology result for a substance, memoized per DTXSID.
+        
+        Common ingredients (water, glycerin...) come up in almost every scan, so
+        repeat lookups skip the bundle query and the extractors entirely.
+        
+        Args:
+            dtxsid: DSSTox substance ID
+            
+        Returns:
+            Toxicology result dict (a fresh copy on every call)
+        """
+        cached = toxicity_cache.get(dtxsid)
+        if cached is not None:
+            logger.debug("ToxValScraper: cache hit for %s", dtxsid)
+            return dict(cached)
+        
+        async with self._session() as db:
+            bundle = await self.service.get_bundle(db, dtxsid)
+        result = self._build_result(dtxsid, bundle)
+        toxicity_cache.set(dtxsid, result)
+        return dict(result)
+    
+    async def search_by_cas_numbers(self, cas_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Search for several CAS numbers with one chemical query and one bundle query.
+        
+        Results land in the same caches ``search_by_cas`` reads, so the
+        per-ingredient lookups that follow are served from memory.
+        
+        Args:
+            cas_numbers: CAS numbers to search
+            
+        Returns:
+            Dictionary mapping each CAS number to its toxicology result
+        """
+        async with self._session() as db:
+            chemicals = await self.service.find_chemicals_by_cas(db, cas_numbers)
+        
+        missing = [
+            chemical["dtxsid"] for chemical in chemicals.values()
+            if chemical and chemical["dtxsid"] not in toxicity_cache
+        ]
+        if missing:
+            async with self._session() as db:
+                bundles = await self.service.get_bundles(db, missing)
+            for dtxsid, bundle in bundles.items():
+                toxicity_cache.set(dtxsid, self._build_result(dtxsid, bundle))
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for cas_number, chemical in chemicals.items():
+            cached = toxicity_cache.get(chemical["dtxsid"]) if chemical else None
+            results[cas_number] = dict(cached) if cached is not None else {"found": False}
+        return results
+    
+    def _build_result(self, dtxsid: str, bundle: Bundle) -> Dict[str, Any]:
+        """
+        Run the extractors over a substance's (skin_eye, cancer, dermal, toxvaldb) rows.
+        
+        Args:
+            dtxsid: DSSTox substance ID
+            bundle: Row lists as returned by ``ToxValService.get_bundle``
+            
+        Returns:
+            Toxicology result dict
+        """
+        skin_eye, cancer, dermal, toxvaldb_data = bundle
+        
+        # Endpoints are matched by substring in several extractors - lower them once
+        for item in skin_eye:
+            item["_endpoint_lc"] = (item.get("endpoint") or "").lower()
+        
+        toxvaldb = self._extract_all_toxvaldb(toxvaldb_data)
+        noael_value = toxvaldb["noael"] or self._extract_noael(dermal)
+        irritation, sensitization = self._extract_skin_eye(skin_eye)
+        
+        return {
+            "found": True,
+            "dtxsid": dtxsid,
+            "irritation_potential": irritation,
+            "sensitization_risk": sensitization,
+            "allergen_status": self._extract_allergen_status(skin_eye),
+            "carcinogenicity": self._extract_carcinogenicity(cancer),
+            "noael_value": noael_value,
+            "dermal_toxicity_values": toxvaldb["values"],
+            "toxicological_effects": toxvaldb["effects"],
+            "safe_concentration": toxvaldb["safe_concentration"],
+            "dermal_absorption": toxvaldb["dermal_absorption"],
+            "source": "toxval",
+            "confidence_score": 0.8
+        }
 
-
-    def _extract_safe_concentration(self, toxvaldb_data):
-        """Extract safe concentration values."""
-        safety_value_types = ['ADI', 'TDI', 'RfD', 'DNEL', 'PNEC', 'MRL']
-        safe_concentrations = []
+    def _extract_all_toxvaldb(self, toxvaldb_data: List[ToxValDBRow]) -> Dict[str, Any]:
+        """
+        Extract NOAEL, toxicity values, effects, safe concentration and dermal
+        absorption from ToxValDB rows in a single pass.
+        
+        Returns:
+            Dict with ``noael``, ``values``, ``effects``, ``safe_concentration``
+            and ``dermal_absorption`` keys
+        """
+        noael = safe_concentration = dermal_absorption = None
+        found_noael = False
+        values = []
+        effects: Dict[str, None] = {}  # insertion-ordered set
         
         for item in toxvaldb_data:
-            logger.debug(f"Evaluating toxvaldb item for safe concentration: {item}")
-            toxval_type = item.get("toxval_type", "")
-            matches_safety_type = any(safety_type in toxval_type for safety_type in safety_value_types)
+            toxval_type = item.toxval_type or ""
+            numeric = item.toxval_numeric
+            effect = item.toxicological_effect
             
-            if matches_safety_type and item.get("human_eco") == "human health":
-                value = item.get("toxval_numeric")
-                unit = item.get("toxval_units", "")
-                
-                if value is not None:
-                    safe_concentrations.append({
-                        "value": value,
-                        "unit": unit,
-                        "type": toxval_type
-                    })
-        if safe_concentrations:
-            primary = safe_concentrations[0]
-            return f"{primary['value']} {primary['unit']} ({primary['type']})"
+            if not found_noael:
+                upper_type = toxval_type.upper()
+                if "NOAEL" in upper_type or "NOEL" in upper_type:
+                    found_noael = True
+                    noael = numeric
+            
+            if numeric is not None:
+                values.append({
+                    "type": item.toxval_type,
+                    "value": numeric,
+                    "unit": item.toxval_units,
+                    "effect": effect,
+                    "route": item.exposure_route,
+                    "species": item.species_common,
+                    "risk_class": item.risk_assessment_class
+                })
+            
+            if effect:
+                effects[effect] = None
+            
+            if (safe_concentration is None and numeric is not None
+                    and item.human_eco == "human health"
+                    and _SAFETY_TYPE_RE.search(toxval_type)):
+                safe_concentration = f"{numeric} {item.toxval_units or ''} ({toxval_type})"
+            
+            if dermal_absorption is None and effect:
+                route = item.exposure_route or ""
+                if _ABSORPTION_RE.search(effect) and _DERMAL_RE.search(route):
+                    dermal_absorption = f"{numeric}% absorption"
+                elif _ABSORB_RE.search(effect) and _SKIN_ROUTE_RE.search(route):
+                    dermal_absorption = f"{numeric} {item.toxval_units or ''} (absorption estimate)"
         
-        return None
+        return {
+            "noael": noael,
+            "values": values or None,
+            "effects": list(effects) if effects else None,
+            "safe_concentration": safe_concentration,
+            "dermal_absorption": dermal_absorption
+        }
 
     def _extract_allergen_status(self, skin_eye_data): # todo: improve searching
         """Extract allergen status information from skin_eye data - simplified version."""
         for item in skin_eye_data:
             classification = item.get("classification")
-            if classification and "skin sens" in classification.lower():
-                logger.debug(f"Found skin sensitization classification: {classification}")
+            if classification and _SKIN_SENS_RE.search(classification):
+                logger.debug("Found skin sensitization classification: %s", classification)
                 return classification
             
-            endpoint = item.get("endpoint", "")
-            if endpoint and "sensitization" in endpoint.lower():
-                result_text = item.get("result_text", "")
+            if "sensitization" in item["_endpoint_lc"]:
+                result_text = item.get("result_text")
                 if result_text:
-                    if "not sensitising" in result_text.lower() or "non-sensitising" in result_text.lower():
+                    if _NOT_SENSITISING_RE.search(result_text):
                         return "Not sensitizing"
-                    elif "sensitising" in result_text.lower() or "sensitizing" in result_text.lower():
+                    elif _SENSITISING_RE.search(result_text):
                         return "Sensitizing agent"
         
         for item in skin_eye_data:
-            result_text = item.get("result_text", "")
-            if result_text:
-                if "allergen" in result_text.lower() or "allergic" in result_text.lower():
-                    return result_text
+            result_text = item.get("result_text")
+            if result_text and _ALLERGEN_RE.search(result_text):
+                return result_text
         
         return None
 
-    def _extract_dermal_absorption(self, toxvaldb_data):
-        """Extract dermal absorption percentage with relaxed criteria."""
-        for item in toxvaldb_data:
-            effect = item.get("toxicological_effect", "").lower()
-            route = item.get("exposure_route", "").lower()
-            
-            if (("absorption" in effect or "penetration" in effect or "permeab" in effect) and
-                ("dermal" in route or "cutaneous" in route)):
-                return f"{item.get('toxval_numeric')}% absorption"
-            
-            if (("absorb" in effect or "bioavailab" in effect) and
-                ("dermal" in route or "cutaneous" in route or "skin" in route)):
-                return f"{item.get('toxval_numeric')} {item.get('toxval_units', '')} (absorption estimate)"
-        
-        return None
-    
-    def _extract_irritation(self, skin_eye_data):
-        """Extract irritation potential from skin and eye data."""
+    def _extract_skin_eye(self, skin_eye_data) -> Tuple[Optional[str], Optional[str]]:
+        """Extract irritation and sensitization potential from skin and eye data in one pass."""
+        irritation = sensitization = None
+        found_irritation = found_sensitization = False
         for item in skin_eye_data:
-            if "irritation" in item.get("endpoint", "").lower():
-                logger.debug(f"Found irritation data: {item.get('result_text')}")
-                return item.get("result_text")
-        logger.debug("No irritation data found")
-        return None
+            endpoint = item["_endpoint_lc"]
+            if not found_irritation and "irritation" in endpoint:
+                found_irritation = True
+                irritation = item.get("result_text")
+                logger.debug("Found irritation data: %s", irritation)
+            if not found_sensitization and "sensitisation" in endpoint:
+                found_sensitization = True
+                sensitization = item.get("result_text")
+                logger.debug("Found sensitization data: %s", sensitization)
+            if found_irritation and found_sensitization:
+                break
         
-    def _extract_sensitization(self, skin_eye_data):
-        """Extract sensitization potential from skin and eye data."""
-        for item in skin_eye_data:
-            if "sensitisation" in item.get("endpoint", "").lower():
-                logger.debug(f"Found sensitization data: {item.get('result_text')}")
-                return item.get("result_text")
-        logger.debug("No sensitization data found")
-        return None
+        if not found_irritation:
+            logger.debug("No irritation data found")
+        if not found_sensitization:
+            logger.debug("No sensitization data found")
+        return irritation, sensitization
         
     def _extract_carcinogenicity(self, cancer_data):
         """Extract carcinogenicity information from cancer data."""
         if cancer_data:
-            logger.debug(f"Found carcinogenicity data: {cancer_data[0].get('cancer_call')}")
+            logger.debug("Found carcinogenicity data: %s", cancer_data[0].get('cancer_call'))
             return cancer_data[0].get("cancer_call")
         logger.debug("No carcinogenicity data found")
         return None
@@ -221,35 +310,3 @@ class ToxValScraper(BaseScraper):
                 return item.get("toxval_numeric")
         return None
 
-    def _extract_noael_from_toxvaldb(self, toxvaldb_data):
-        """Extract NOAEL value from toxvaldb data."""
-        for item in toxvaldb_data:
-            toxval_type = item.get("toxval_type", "").upper()
-            if "NOAEL" in toxval_type or "NOEL" in toxval_type:
-                return item.get("toxval_numeric")
-        return None
-
-    def _extract_toxicity_values_from_toxvaldb(self, toxvaldb_data):
-        """Extract structured toxicity values from toxvaldb."""
-        result = []
-        for item in toxvaldb_data:
-            if item.get("toxval_numeric") is not None:
-                result.append({
-                    "type": item.get("toxval_type"),
-                    "value": item.get("toxval_numeric"),
-                    "unit": item.get("toxval_units"),
-                    "effect": item.get("toxicological_effect"),
-                    "route": item.get("exposure_route"),
-                    "species": item.get("species_common"),
-                    "risk_class": item.get("risk_assessment_class")
-                })
-        return result if result else None
-
-    def _extract_effects_from_toxvaldb(self, toxvaldb_data):
-        """Extract unique toxicological effects from toxvaldb."""
-        effects = set()
-        for item in toxvaldb_data:
-            effect = item.get("toxicological_effect")
-            if effect:
-                effects.add(effect)
-        return list(effects) if effects else None
\ No newline at end of file
@@ -1,5 +1,8 @@
-from typing import List, Optional, Dict, Any
+from contextlib import AsyncExitStack
+from contextvars import ContextVar
+from typing import List, Optional, Dict, Any, Tuple
 import asyncio
+import os
 import time
 import logging
 from ..models.chemical_identity import (
@@ -9,81 +12,227 @@ from ..models.chemical_identity import (
 from ..scrapers.pubchem_scraper_v2 import PubChemScraperV2
 from ..scrapers.pubchem_scraper import PubChemScraper
 from ..scrapers.toxval_scraper import ToxValScraper
+from ..scrapers.base_scraper import BaseScraper
+from ..utils.cache import LRUCache
+from .chemical_mapping_store import ChemicalMappingStore
 
 # from ..scrapers.comptox_scraper import CompToxScraper
 # from ..scrapers.echa_scraper import ECHAScraper
 
 logger = logging.getLogger(__name__)
 
+# Found mappings are stable for a day; clean "not found" answers are re-checked sooner
+MAPPING_CACHE_TTL = 24 * 3600
+NOT_FOUND_CACHE_TTL = 600
+
+# Ingredients mapped at a time across all batches; each scraper's rate limiter paces its own upstream
+MAP_CONCURRENCY = int(os.getenv("MAP_CONCURRENCY", "8"))
+# Wall-clock budget per ingredient across all sources
+MAP_DEADLINE = float(os.getenv("MAP_DEADLINE", "30"))
+
+# Scraper result keys copied verbatim onto each domain model; the mapper sets the rest
+_MAPPER_SET_FIELDS = ("inci_name", "source", "confidence_score")
+_BASIC_FIELDS = tuple(f for f in BasicChemicalIdentifiers.model_fields if f not in _MAPPER_SET_FIELDS)
+_TOXICOLOGY_FIELDS = tuple(f for f in ToxicologyData.model_fields if f not in _MAPPER_SET_FIELDS)
+_REGULATORY_FIELDS = tuple(f for f in RegulatoryData.model_fields if f not in _MAPPER_SET_FIELDS)
+_PHYSICAL_FIELDS = tuple(f for f in PhysicalChemicalData.model_fields if f not in _MAPPER_SET_FIELDS)
+
+# Per domain: model built from a source's hit, the result keys copied onto it, log label
+_KIND_SPEC = {
+    "basic": (BasicChemicalIdentifiers, _BASIC_FIELDS, "Basic identifiers"),
+    "toxicology": (ToxicologyData, _TOXICOLOGY_FIELDS, "Toxicology data"),
+    "regulatory": (RegulatoryData, _REGULATORY_FIELDS, "Regulatory data"),
+    "physical": (PhysicalChemicalData, _PHYSICAL_FIELDS, "Physical data"),
+}
+
+# Scraper instances opened once by map_ingredients_batch and shared by every ingredient in it
+_batch_scrapers: ContextVar[Optional[Dict[type, BaseScraper]]] = ContextVar("batch_scrapers", default=None)
+
+class SourceUnavailableError(Exception):
+    """No source found an ingredient and at least one of them failed, so "not found" is not a real answer."""
+
+
 class ChemicalIdentityMapper:
     """
     Main service for mapping INCI names to comprehensive chemical identifiers.
     Always collects data from ALL available sources.
     """
     
-    def __init__(self):
-        # Domain-specific scraper configurations
-        self.basic_scrapers = [
-            # ("pubchem", PubChemScraper) # replaced by PubChemScraperV2
-            ("pubchem", PubChemScraperV2)
+    def __init__(self, store: Optional[ChemicalMappingStore] = None, deadline: float = MAP_DEADLINE):
+        """
+        Args:
+            store: Optional persistent store consulted on in-process cache misses
+            deadline: Seconds one ingredient may take; sources still running
+                after it are dropped and reported as timeouts
+        """
+        self.store = store
+        
+        # Domain-specific scrapers, built once and reused by every lookup
+        self.basic_scrapers: List[Tuple[str, BaseScraper]] = [
+            # ("pubchem", PubChemScraper()) # replaced by PubChemScraperV2
+            ("pubchem", PubChemScraperV2())
 
         ]
         
-        self.toxicology_scrapers = [ # TODO
-            ("toxval", ToxValScraper)
+        self.toxicology_scrapers: List[Tuple[str, BaseScraper]] = [ # TODO
+            ("toxval", ToxValScraper())
         ]
         
-        self.regulatory_scrapers = [ # TODO
-            # ("echa", ECHAScraper)  # Will be added
+        self.regulatory_scrapers: List[Tuple[str, BaseScraper]] = [ # TODO
+            # ("echa", ECHAScraper())  # Will be added
         ]
         
-        self.physical_scrapers = [
+        self.physical_scrapers: List[Tuple[str, BaseScraper]] = [
             # TODO 
         ]
+        
+        # Results keyed by normalized INCI name - aqua/glycerin/parfum are on nearly every label
+        self._cache = LRUCache(maxsize=2048, ttl=MAPPING_CACHE_TTL)
+        self._not_found_cache = LRUCache(maxsize=1024, ttl=NOT_FOUND_CACHE_TTL)
+        # Shared by concurrent map_ingredients_batch calls (the mapper is a per-process singleton).
+        # Created in the loop that uses it: the mapper is built at import time, and a
+        # semaphore bound to one loop fails in the next (tests, TestClient, reloads).
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.deadline = deadline
+    
+    def _scraper(self, scraper: BaseScraper) -> BaseScraper:
+        """Return the current batch's open instance of ``scraper``'s class, or ``scraper`` itself outside a batch."""
+        return (_batch_scrapers.get() or {}).get(type(scraper), scraper)
+    
+    def _all_scrapers(self) -> List[BaseScraper]:
+        return [
+            scraper
+            for scrapers in (self.basic_scrapers, self.toxicology_scrapers, self.regulatory_scrapers, self.physical_scrapers)
+            for _, scraper in scrapers
+        ]
+    
+    def _concurrency(self) -> asyncio.Semaphore:
+        """Return the batch semaphore, creating it on first use in the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(MAP_CONCURRENCY)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def close(self):
+        """Release the scrapers' resources (called on application shutdown)."""
+        for scraper in self._all_scrapers():
+            await scraper.close()
+        self._semaphore = None
+        self._semaphore_loop = None
+    
+    @staticmethod
+    def _cache_key(inci_name: str) -> str:
+        return inci_name.strip().casefold()
+    
+    @staticmethod
+    def _relabel(result: Optional[ChemicalIdentityResult], inci_name: str) -> Optional[ChemicalIdentityResult]:
+        """Return ``result`` under the requested spelling of the INCI name."""
+        if result is None or result.inci_name == inci_name:
+            return result
+        return result.model_copy(update={"inci_name": inci_name})
+    
+    def _get_cached(self, inci_name: str) -> Optional[ChemicalIdentityResult]:
+        """Return a cached result for ``inci_name`` (relabelled to the requested name) or None."""
+        key = self._cache_key(inci_name)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._not_found_cache.get(key)
+        return self._relabel(result, inci_name)
+    
+    def _store(self, inci_name: str, result: ChemicalIdentityResult):
+        """Cache found results and clean misses; results with errors (even partial ones) are retried next time."""
+        if result.errors:
+            return
+        key = self._cache_key(inci_name)
+        if result.found:
+            self._cache.set(key, result)
+        else:
+            self._not_found_cache.set(key, result)
     
     async def map_ingredient(self, inci_name: str) -> ChemicalIdentityResult:
         """
         Map INCI ingredient to comprehensive chemical data from ALL sources.
         
+        Results are served from an in-process cache when the same INCI name
+        was mapped recently, then from the persistent store if one is configured.
+        
         Args:
             inci_name: INCI name to map
             
         Returns:
             ChemicalIdentityResult with comprehensive data
         """
-        start_time = time.time()
+        cached = self._get_cached(inci_name)
+        if cached is not None:
+            return cached
+        
+        if self.store is not None:
+            stored = await self.store.get(self._cache_key(inci_name))
+            if stored is not None:
+                self._store(inci_name, stored)
+                return self._relabel(stored, inci_name)
         
-        basic_task = self._collect_basic_identifiers(inci_name)
-        await asyncio.sleep(0.1)
-        toxicology_task = self._collect_toxicology_data(inci_name)
-        await asyncio.sleep(0.1)
-        regulatory_task = self._collect_regulatory_data(inci_name)
-        await asyncio.sleep(0.1) # check if we can remove this to avoid err 503
-        physical_task = self._collect_physical_data(inci_name)
+        return await self._map_and_save(inci_name)
+    
+    async def _map_and_save(self, inci_name: str) -> ChemicalIdentityResult:
+        """Query all sources for a name both caches missed, then cache and persist the result."""
+        result = await self._map_ingredient_uncached(inci_name)
+        self._store(inci_name, result)
+        if self.store is not None and not result.errors:
+            await self.store.set(self._cache_key(inci_name), result)
+        return result
+    
+    async def invalidate(self, inci_name: str):
+        """Forget any cached or stored mapping for ``inci_name`` so the next lookup re-queries all sources."""
+        key = self._cache_key(inci_name)
+        self._cache.delete(key)
+        self._not_found_cache.delete(key)
+        if self.store is not None:
+            await self.store.invalidate(key)
+    
+    async def _map_ingredient_uncached(self, inci_name: str) -> ChemicalIdentityResult:
+        """Query all sources for ``inci_name``, bypassing the cache."""
+        start_time = time.time()
         
         try:
-            basic_data, tox_data, reg_data, phys_data = await asyncio.gather(
-                basic_task, toxicology_task, regulatory_task, physical_task,
-                return_exceptions=True
-            )
+            # No stagger needed - each scraper's rate limiter paces its upstream.
+            # Toxicology needs the CAS number, so it awaits the same basic task.
+            basic_task = asyncio.ensure_future(self._collect_basic_identifiers(inci_name))
+            tasks = {
+                "basic": basic_task,
+                "toxicology": asyncio.ensure_future(self._collect_toxicology_data(inci_name, basic_task)),
+                "regulatory": asyncio.ensure_future(self._collect_regulatory_data(inci_name)),
+                "physical": asyncio.ensure_future(self._collect_physical_data(inci_name)),
+            }
+            # asyncio.wait (unlike a timeout around gather) keeps whatever finished in time
+            try:
+                _, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+            except asyncio.CancelledError:
+                for task in tasks.values():
+                    task.cancel()
+                raise
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
             
             errors = []
-            if isinstance(basic_data, Exception):
-                logger.warning(f"Basic identifiers error for {inci_name}: {basic_data}")
-                errors.append(f"basic: {str(basic_data)}")
-                basic_data = None
-            if isinstance(tox_data, Exception):
-                logger.warning(f"Toxicology data error for {inci_name}: {tox_data}")
-                errors.append(f"toxicology: {str(tox_data)}")
-                tox_data = None
-            if isinstance(reg_data, Exception):
-                logger.warning(f"Regulatory data error for {inci_name}: {reg_data}")
-                errors.append(f"regulatory: {str(reg_data)}")
-                reg_data = None
-            if isinstance(phys_data, Exception):
-                logger.warning(f"Physical data error for {inci_name}: {phys_data}")
-                errors.append(f"physical: {str(phys_data)}")
-                phys_data = None
+            collected = {}
+            for source, task in tasks.items():
+                collected[source] = None
+                if task in pending or task.cancelled():
+                    logger.warning(f"{source.capitalize()} data for {inci_name} missed the {self.deadline}s deadline")
+                    errors.append(f"{source}: timeout")
+                elif task.exception() is not None:
+                    logger.warning(f"{source.capitalize()} data error for {inci_name}: {task.exception()}")
+                    errors.append(f"{source}: {str(task.exception())}")
+                else:
+                    collected[source] = task.result()
+            basic_data, tox_data, reg_data, phys_data = (
+                collected["basic"], collected["toxicology"], collected["regulatory"], collected["physical"]
+            )
             
             comprehensive_data = ComprehensiveChemicalData(
                 inci_name=inci_name,
@@ -93,17 +242,9 @@ class ChemicalIdentityMapper:
                 physical_chemical=phys_data
             )
             
-            sources_used = []
-            if basic_data:
-                sources_used.append(basic_data.source)
-            if tox_data:
-                sources_used.append(tox_data.source)
-            if reg_data:
-                sources_used.append(reg_data.source)
-            if phys_data:
-                sources_used.append(phys_data.source)
-                
-            comprehensive_data.sources_used = list(set(sources_used))
+            # Order-preserving dedup, so sources_used is stable across processes
+            sources_used = list(dict.fromkeys(d.source for d in (basic_data, tox_data, reg_data, phys_data) if d))
+            comprehensive_data.sources_used = sources_used
             comprehensive_data.calculate_completeness()
             
             processing_time = (time.time() - start_time) * 1000
@@ -126,122 +267,137 @@ class ChemicalIdentityMapper:
                 processing_time_ms=(time.time() - start_time) * 1000
             )
     
-    async def _collect_basic_identifiers(self, inci_name: str) -> Optional[BasicChemicalIdentifiers]:
-        """Collect basic chemical identifiers from primary sources."""
-        for source_name, scraper_class in self.basic_scrapers:
+    async def _collect(self, kind: str, inci_name: str, cas_number: Optional[str] = None):
+        """
+        Query one domain's sources in order and build its model from the first hit.
+        
+        Args:
+            kind: Key of ``_KIND_SPEC``; the sources are ``self.<kind>_scrapers``
+            inci_name: INCI name to look up
+            cas_number: Looked up instead of the name when known
+            
+        Returns:
+            The domain model, or None if no source found the ingredient
+            
+        Raises:
+            SourceUnavailableError: If no source found it and any of them failed,
+                so the caller reports the error instead of caching a false miss
+        """
+        model, fields, label = _KIND_SPEC[kind]
+        failures = []
+        for source_name, scraper in getattr(self, f"{kind}_scrapers"):
             try:
-                async with scraper_class() as scraper:
+                scraper = self._scraper(scraper)
+                if cas_number:
+                    data = await scraper.search_by_cas(cas_number)
+                else:
                     data = await scraper.search_by_name(inci_name)
-                    
-                    if data.get("found"):
-                        return BasicChemicalIdentifiers(
-                            inci_name=inci_name,
-                            cas_number=data.get("cas_number"),
-                            ec_number=data.get("ec_number"),
-                            smiles=data.get("smiles"),
-                            inchi=data.get("inchi"),
-                            inchi_key=data.get("inchi_key"),
-                            systematic_name=data.get("systematic_name"),
-                            molecular_formula=data.get("molecular_formula"),
-                            molecular_weight=data.get("molecular_weight"),
-                            source=source_name,
-                            confidence_score=data.get("confidence_score", 0.5)
-                        )
+                
+                if data.get("found"):
+                    named = {"inci_name": inci_name} if "inci_name" in model.model_fields else {}
+                    # Scraper output is already typed; skip re-validating it field by field
+                    return model.model_construct(
+                        source=source_name,
+                        confidence_score=data.get("confidence_score", 0.5),
+                        **named,
+                        **{field: data.get(field) for field in fields}
+                    )
+                if data.get("error"):
+                    failures.append(f"{source_name}: {data['error']}")
             except Exception as e:
-                logger.warning(f"Basic identifiers failed for {source_name}: {e}")
-                continue
+                logger.warning(f"{label} failed for {source_name}: {e}")
+                failures.append(f"{source_name}: {e}")
         
+        if failures:
+            raise SourceUnavailableError("; ".join(failures))
         return None
     
-    async def _collect_toxicology_data(self, inci_name: str) -> Optional[ToxicologyData]:
-        """Collect toxicological data from specialized sources."""
+    async def _collect_basic_identifiers(self, inci_name: str) -> Optional[BasicChemicalIdentifiers]:
+        """Collect basic chemical identifiers from primary sources."""
+        return await self._collect("basic", inci_name)
+    
+    async def _collect_toxicology_data(
+        self, inci_name: str, basic_task: Optional["asyncio.Future[Optional[BasicChemicalIdentifiers]]"] = None
+    ) -> Optional[ToxicologyData]:
+        """
+        Collect toxicological data from specialized sources.
+        
+        Args:
+            inci_name: INCI name to look up
+            basic_task: Basic identifier lookup already in flight for ``inci_name``;
+                its CAS number is reused instead of querying the basic sources again
+        """
         if not self.toxicology_scrapers:
             return None
-            
-        basic_data = await self._collect_basic_identifiers(inci_name)
-        cas_number = basic_data.cas_number if basic_data else None
-        
-        for source_name, scraper_class in self.toxicology_scrapers:
-            try:
-                async with scraper_class() as scraper:
-                    if cas_number:
-                        data = await scraper.search_by_cas(cas_number)
-                    else:
-                        data = await scraper.search_by_name(inci_name)
-                    
-                    if data.get("found"):
-                        return ToxicologyData(
-                            allergen_status=data.get("allergen_status"),
-                            phototoxicity_risk=data.get("phototoxicity_risk"),
-                            irritation_potential=data.get("irritation_potential"),
-                            sensitization_risk=data.get("sensitization_risk"),
-                            noael_value=data.get("noael_value"),
-                            safe_concentration=data.get("safe_concentration"),
-                            dermal_absorption=data.get("dermal_absorption"),
-                            carcinogenicity=data.get("carcinogenicity"),
-                            dermal_toxicity_values=data.get("dermal_toxicity_values"),
-                            toxicological_effects=data.get("toxicological_effects"),
-                            dtxsid=data.get("dtxsid"),
-                            source=source_name,
-                            confidence_score=data.get("confidence_score", 0.5)
-                        )
-            except Exception as e:
-                logger.warning(f"Toxicology data failed for {source_name}: {e}")
-                continue
         
-        return None
+        try:
+            basic_data = await (basic_task if basic_task is not None else self._collect_basic_identifiers(inci_name))
+        except Exception:
+            basic_data = None  # reported by the caller under "basic"
+        cas_number = basic_data.cas_number if basic_data else None
+        return await self._collect("toxicology", inci_name, cas_number)
     
     async def _collect_regulatory_data(self, inci_name: str) -> Optional[RegulatoryData]:
         """Collect regulatory data from compliance sources."""
-        if not self.regulatory_scrapers:
-            return None
-            
-        for source_name, scraper_class in self.regulatory_scrapers:
-            try:
-                async with scraper_class() as scraper:
-                    data = await scraper.search_by_name(inci_name)
-                    
-                    if data.get("found"):
-                        return RegulatoryData(
-                            eu_restrictions=data.get("eu_restrictions"),
-                            us_restrictions=data.get("us_restrictions"),
-                            prohibited_categories=data.get("prohibited_categories"),
-                            concentration_limits=data.get("concentration_limits"),
-                            labeling_requirements=data.get("labeling_requirements"),
-                            allergen_declaration_required=data.get("allergen_declaration_required"),
-                            source=source_name,
-                            confidence_score=data.get("confidence_score", 0.5)
-                        )
-            except Exception as e:
-                logger.warning(f"Regulatory data failed for {source_name}: {e}")
-                continue
-        
-        return None
+        return await self._collect("regulatory", inci_name)
     
     async def _collect_physical_data(self, inci_name: str) -> Optional[PhysicalChemicalData]:
         """Collect physical and chemical properties."""
-        for source_name, scraper_class in self.physical_scrapers:
+        return await self._collect("physical", inci_name)
+    
+    async def _prefetch(self, inci_names: List[str]):
+        """
+        Warm the basic identifier and toxicology caches for a batch within one deadline.
+        
+        The prefetch is only an optimization: whatever has not finished by then is
+        dropped and looked up per ingredient under each ingredient's own deadline.
+        """
+        async def warm():
+            await self._prefetch_basic_identifiers(inci_names)
+            await self._prefetch_toxicology(inci_names)
+        
+        try:
+            await asyncio.wait_for(warm(), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            logger.warning(f"Batch prefetch for {len(inci_names)} ingredients missed the {self.deadline}s deadline")
+    
+    async def _prefetch_basic_identifiers(self, inci_names: List[str]):
+        """
+        Warm the scrapers' lookup cache with one batch call per basic source, so the
+        per-ingredient mapping that follows reads basic identifiers from the cache.
+        """
+        for source_name, scraper in self.basic_scrapers:
             try:
-                async with scraper_class() as scraper:
-                    data = await scraper.search_by_name(inci_name)
-                    
-                    if data.get("found"):
-                        return PhysicalChemicalData(
-                            solubility_water=data.get("solubility_water"),
-                            solubility_oil=data.get("solubility_oil"),
-                            ph_value=data.get("ph_value"),
-                            logp_value=data.get("logp_value"),
-                            stability=data.get("stability"),
-                            volatility=data.get("volatility"),
-                            melting_point=data.get("melting_point"),
-                            source=source_name,
-                            confidence_score=data.get("confidence_score", 0.5)
-                        )
+                scraper = self._scraper(scraper)
+                await scraper.search_by_names(inci_names)
             except Exception as e:
-                logger.warning(f"Physical data failed for {source_name}: {e}")
-                continue
+                logger.warning(f"Batch basic identifiers failed for {source_name}: {e}")
+    
+    async def _prefetch_toxicology(self, inci_names: List[str]):
+        """
+        Warm the toxicology sources with one bulk lookup per source for every CAS
+        number resolved by the basic identifier prefetch.
+        """
+        if not self.toxicology_scrapers:
+            return
         
-        return None
+        basic = await asyncio.gather(
+            *(self._collect_basic_identifiers(name) for name in inci_names),
+            return_exceptions=True
+        )
+        cas_numbers = [
+            data.cas_number for data in basic
+            if isinstance(data, BasicChemicalIdentifiers) and data.cas_number
+        ]
+        if not cas_numbers:
+            return
+        
+        for source_name, scraper in self.toxicology_scrapers:
+            try:
+                scraper = self._scraper(scraper)
+                await scraper.search_by_cas_numbers(cas_numbers)
+            except Exception as e:
+                logger.warning(f"Batch toxicology data failed for {source_name}: {e}")
     
     async def map_ingredients_batch(self, inci_names: List[str]) -> List[ChemicalIdentityResult]:
         """
@@ -253,32 +409,66 @@ class ChemicalIdentityMapper:
         Returns:
             List of comprehensive mapping results
         """
-        batch_size = 3
-        results = []
+        results: List[Optional[ChemicalIdentityResult]] = [self._get_cached(name) for name in inci_names]
         
-        for i in range(0, len(inci_names), batch_size):
-            batch = inci_names[i:i + batch_size]
-            batch_tasks = [self.map_ingredient(name) for name in batch]
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    error_result = ChemicalIdentityResult(
-                        inci_name="unknown",
-                        found=False,
-                        errors=[str(result)]
-                    )
-                    results.append(error_result)
-                else:
-                    results.append(result)
-            
-            if i + batch_size < len(inci_names):
-                await asyncio.sleep(2.0)
+        # Only cache misses are mapped, and each distinct (normalized) name only
+        # once - repeats on a label share its result. Up to MAP_CONCURRENCY lookups
+        # are in flight process-wide; upstream quotas are enforced by the scrapers.
+        pending: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(self._cache_key(inci_names[i]), []).append(i)
+        
+        # One store query for every in-process miss; only what it lacks is scraped
+        if pending and self.store is not None:
+            for key, stored in (await self.store.get_many(list(pending))).items():
+                indices = pending.pop(key)
+                self._store(inci_names[indices[0]], stored)
+                for i in indices:
+                    results[i] = self._relabel(stored, inci_names[i])
+        unique = list(pending.values())
+        
+        if not unique:
+            return results
+        
+        # Batch-scoped instances, opened and closed with the batch (for scrapers holding per-context resources)
+        scraper_classes = dict.fromkeys(type(scraper) for scraper in self._all_scrapers())
+        async with AsyncExitStack() as stack:
+            token = _batch_scrapers.set({
+                scraper_class: await stack.enter_async_context(scraper_class())
+                for scraper_class in scraper_classes
+            })
+            try:
+                misses = [inci_names[indices[0]] for indices in unique]
+                await self._prefetch(misses)
+                
+                # get_many already missed these names, so skip the per-name store read
+                semaphore = self._concurrency()
+                
+                async def bounded(inci_name: str) -> ChemicalIdentityResult:
+                    async with semaphore:
+                        cached = self._get_cached(inci_name)  # another batch may have mapped it meanwhile
+                        if cached is not None:
+                            return cached
+                        return await self._map_and_save(inci_name)
+                
+                mapped = await asyncio.gather(
+                    *(bounded(inci_names[indices[0]]) for indices in unique),
+                    return_exceptions=True
+                )
+            finally:
+                _batch_scrapers.reset(token)
+        
+        for indices, result in zip(unique, mapped):
+            if isinstance(result, Exception):
+                result = ChemicalIdentityResult(
+                    inci_name="unknown",
+                    found=False,
+                    errors=[str(result)]
+                )
+            results[indices[0]] = result
+            for i in indices[1:]:
+                same_name = result.inci_name == inci_names[i] or result.inci_name == "unknown"
+                results[i] = result if same_name else result.model_copy(update={"inci_name": inci_names[i]})
         
         return results
-    
-    @property
-    def identifiers(self) -> Optional[BasicChemicalIdentifiers]:
-        """Backward compatibility property for old API."""
-        pass
\ No newline at end of file
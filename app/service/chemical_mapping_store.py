@@ -0,0 +1,85 @@
+"""
+Persistent store for ingredient mapping results.
+
+Chemical identity and toxicology data barely change, so mapped ingredients are
+kept in MongoDB keyed by normalized INCI name and survive restarts. The
+in-process LRU in ``ChemicalIdentityMapper`` sits in front of it; this store
+only answers that cache's misses. Expiry is left to the TTL index on
+``expires_at`` (see ``app.core.database.ensure_indexes``). Store failures are
+logged and treated as misses, so mapping keeps working when MongoDB is
+unavailable.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ..models.chemical_identity import ChemicalIdentityResult
+
+logger = logging.getLogger(__name__)
+
+MAPPING_STORE_TTL = int(os.getenv("MAPPING_STORE_TTL", str(30 * 24 * 3600)))
+MAPPING_STORE_NOT_FOUND_TTL = int(os.getenv("MAPPING_STORE_NOT_FOUND_TTL", str(24 * 3600)))
+
+
+class ChemicalMappingStore:
+    """Read-through store of ``ChemicalIdentityResult`` documents."""
+
+    def __init__(self, collection):
+        """
+        Args:
+            collection: Motor collection holding the mapping documents
+        """
+        self.collection = collection
+
+    async def get_many(self, keys: List[str]) -> Dict[str, ChemicalIdentityResult]:
+        """
+        Fetch stored results for several normalized names with one query.
+
+        Args:
+            keys: Normalized INCI names
+
+        Returns:
+            Dictionary of the keys that were found, mapped to their results
+        """
+        if not keys:
+            return {}
+        now = datetime.now(timezone.utc)
+        try:
+            cursor = self.collection.find({"_id": {"$in": keys}, "expires_at": {"$gt": now}})
+            docs = await cursor.to_list(length=len(keys))
+        except Exception as e:
+            logger.warning(f"Mapping store lookup failed: {e}")
+            return {}
+
+        found: Dict[str, ChemicalIdentityResult] = {}
+        for doc in docs:
+            try:
+                found[doc["_id"]] = ChemicalIdentityResult.model_validate(doc["result"])
+            except Exception as e:
+                logger.warning(f"Discarding unreadable stored mapping for {doc['_id']}: {e}")
+        return found
+
+    async def get(self, key: str) -> Optional[ChemicalIdentityResult]:
+        """Fetch the stored result for one normalized name, or None."""
+        return (await self.get_many([key])).get(key)
+
+    async def set(self, key: str, result: ChemicalIdentityResult):
+        """Store a result; not-found results expire sooner than found ones."""
+        ttl = MAPPING_STORE_TTL if result.found else MAPPING_STORE_NOT_FOUND_TTL
+        doc = {
+            "result": result.model_dump(mode="json"),
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        }
+        try:
+            await self.collection.replace_one({"_id": key}, doc, upsert=True)
+        except Exception as e:
+            logger.warning(f"Mapping store write failed for {key}: {e}")
+
+    async def invalidate(self, key: str):
+        """Forget the stored result for one normalized name."""
+        try:
+            await self.collection.delete_one({"_id": key})
+        except Exception as e:
+            logger.warning(f"Mapping store invalidation failed for {key}: {e}")
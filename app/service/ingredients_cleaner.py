@@ -1,12 +1,17 @@
 import re
 from typing import List
 
+_BULLET_CHARS_RE = re.compile(r'[•\*\+\-]')
+_PARENTHESIZED_RE = re.compile(r'\([^)]*\)')
+_DISALLOWED_CHARS_RE = re.compile(r'[^\w\s,.:;()\-]')
+
 
 class IngredientsCleaner:
     INGREDIENTS_MARKERS = [
         "ingredients:", "ingredients", "składniki:", "składniki", "inci:", "inci",
         "zawiera:", "zawiera", "skład:", "skład", "contains:", "contains"
     ]
+    STOP_WORDS = ("www.", ".com", "uwagi", "note:", "przyp")
     
     def __init__(self):
         """
@@ -42,19 +47,19 @@ class IngredientsCleaner:
             if pattern in ingredients_section:
                 ingredients_section = ingredients_section.split(pattern, 1)[0]
         
-        ingredients_section = re.sub(r'[•\*\+\-]', '', ingredients_section)
+        ingredients_section = _BULLET_CHARS_RE.sub('', ingredients_section)
         raw_ingredients = [i.strip() for i in ingredients_section.split(',')]
         
         clean_ingredients = []
         for ingredient in raw_ingredients:
-            ingredient = re.sub(r'\([^)]*\)', '', ingredient)
+            ingredient = _PARENTHESIZED_RE.sub('', ingredient)
             #ingredient = re.sub(r'\d+%?', '', ingredient)
             ingredient = ingredient.strip()
             
             if len(ingredient) < 3:
                 continue
             
-            if ingredient and not any(stop_word in ingredient for stop_word in ["www.", ".com", "uwagi", "note:", "przyp"]):
+            if ingredient and not any(stop_word in ingredient for stop_word in self.STOP_WORDS):
                 clean_ingredients.append(ingredient)
         
         return clean_ingredients
@@ -68,7 +73,7 @@ class IngredientsCleaner:
         """
         text = " ".join(text.split())
         text = text.lower()
-        text = re.sub(r'[^\w\s,.:;()\-]', '', text)
+        text = _DISALLOWED_CHARS_RE.sub('', text)
         
         return text
     
\ No newline at end of file
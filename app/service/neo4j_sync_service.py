@@ -1,8 +1,88 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from app.core.neo4j_client import neo4j_client
 from app.models.chemical_identity import ChemicalIdentityResult, ToxicologyData, BasicChemicalIdentifiers
 
+_INGREDIENT_UPSERT = """
+UNWIND $rows AS row
+MERGE (i:Ingredient {key: row.key})
+SET i.inci = row.inci,
+    i.cas = row.cas,
+    i.inchi_key = row.inchi_key,
+    i.dtxsid = row.dtxsid
+"""
+
+_HAZARD_UPSERT = """
+UNWIND $rows AS row
+MATCH (i:Ingredient {key: row.key})
+UNWIND row.hazards AS h
+  MERGE (z:Hazard {
+    type: h.type,
+    route: toLower(h.route),
+    unit: h.unit,
+    species: h.species,
+    value: h.value
+  })
+  SET z.severity = h.severity,
+      z.source = h.source,
+      z.confidence = h.confidence
+  MERGE (i)-[:HAS_HAZARD]->(z)
+  FOREACH (e IN CASE WHEN h.effect IS NULL THEN [] ELSE [h.effect] END |
+    MERGE (ef:Effect {name: e})
+    MERGE (z)-[:CAUSES]->(ef)
+  )
+"""
+
+_HED_UPSERT = """
+UNWIND $rows AS row
+
+// Find existing ingredient by inci name (case-insensitive)
+MATCH (i:Ingredient)
+WHERE toLower(i.inci) = toLower(row.inci_name)
+
+// Create/Update HED Assessment node (unique per ingredient)
+MERGE (h:HEDAssessment {ingredient_key: i.key})
+SET h.dtxsid = row.dtxsid,
+    h.hed_mg_kg = row.hed_mg_kg,
+    h.total_safe_dose_mg = row.total_safe_dose_mg,
+    h.calculation_method = row.calculation_method,
+    h.source_toxicity_type = row.source_toxicity_type,
+    h.source_animal_species = row.source_animal_species,
+    h.source_route = row.source_route,
+    h.source_effect = row.source_effect,
+    h.source_value_mg_kg = row.source_value_mg_kg,
+    h.safe_concentration_percent = row.safe_concentration_percent,
+    h.max_dermal_application_mg = row.max_dermal_application_mg,
+    h.safety_factor = row.safety_factor,
+    h.risk_assessment = row.risk_assessment,
+    h.recommendation = row.recommendation,
+    h.total_hed_calculations = row.total_hed_calculations,
+    h.relevant_entries = row.relevant_entries,
+    h.last_updated = $timestamp
+
+// Link ingredient to HED assessment
+MERGE (i)-[:HAS_HED_ASSESSMENT]->(h)
+
+// Create/Link to Risk Assessment effect
+WITH i, h, row.risk_assessment AS risk_level
+MERGE (e:Effect {name: 'hed_safety_threshold'})
+SET e.description = 'Human Equivalent Dose safety threshold from animal toxicology'
+MERGE (h)-[:ASSESSED_AS {level: risk_level}]->(e)
+"""
+
+_HED_FIELDS = (
+    "dtxsid", "hed_mg_kg", "total_safe_dose_mg", "calculation_method",
+    "source_toxicity_type", "source_animal_species", "source_route", "source_effect",
+    "source_value_mg_kg", "safe_concentration_percent", "max_dermal_application_mg",
+    "safety_factor", "risk_assessment", "recommendation", "total_hed_calculations",
+    "relevant_entries",
+)
+
+def _hed_row(inci_name: str, neo4j_hed_data: Dict[str, Any]) -> Dict[str, Any]:
+    row = {field: neo4j_hed_data.get(field) for field in _HED_FIELDS}
+    row["inci_name"] = inci_name
+    return row
+
 def _ingredient_key(basic: Optional[BasicChemicalIdentifiers], tox: Optional[ToxicologyData], inci_name: str) -> str:
     if basic and basic.inchi_key:
         return basic.inchi_key.lower()
@@ -95,50 +175,23 @@ def _hazards_from_tox(tox: ToxicologyData) -> List[Dict[str, Any]]:
         })
     return hazards
 
-async def upsert_ingredient_from_identity(result: ChemicalIdentityResult):
-    if not result or not result.found or not result.comprehensive_data:
-        return
+def _identity_rows(result: ChemicalIdentityResult):
+    """Build the Ingredient row and optional hazard row for one mapping result."""
     basic = result.comprehensive_data.basic_identifiers
     tox = result.comprehensive_data.toxicology
     key = _ingredient_key(basic, tox, result.inci_name)
-
-    await neo4j_client.run("""
-    MERGE (i:Ingredient {key: $key})
-    SET i.inci = $inci,
-        i.cas = $cas,
-        i.inchi_key = $inchi_key,
-        i.dtxsid = $dtxsid
-    """, {
+    ingredient = {
         "key": key,
         "inci": result.inci_name,
         "cas": basic.cas_number if basic else None,
         "inchi_key": basic.inchi_key if basic else None,
         "dtxsid": tox.dtxsid if tox else None
-    })
+    }
+    hazards = _hazards_from_tox(tox) if tox else []
+    return ingredient, ({"key": key, "hazards": hazards} if hazards else None)
 
-    if tox:
-        hazards = _hazards_from_tox(tox)
-        if hazards:
-            await neo4j_client.run("""
-            MATCH (i:Ingredient {key: $key})
-            WITH i, $hazards AS hz
-            UNWIND hz AS h
-              MERGE (z:Hazard {
-                type: h.type,
-                route: toLower(h.route),
-                unit: h.unit,
-                species: h.species,
-                value: h.value
-              })
-              SET z.severity = h.severity,
-                  z.source = h.source,
-                  z.confidence = h.confidence
-              MERGE (i)-[:HAS_HAZARD]->(z)
-              FOREACH (e IN CASE WHEN h.effect IS NULL THEN [] ELSE [h.effect] END |
-                MERGE (ef:Effect {name: e})
-                MERGE (z)-[:CAUSES]->(ef)
-              )
-            """, {"key": key, "hazards": hazards})
+async def upsert_ingredient_from_identity(result: ChemicalIdentityResult):
+    await upsert_ingredients_with_hed_batch([(result, None)])
 
 async def upsert_product(product_id: str, ingredient_keys: List[str]):
     await neo4j_client.run("""
@@ -167,61 +220,9 @@ async def upsert_hed_assessment(inci_name: str, neo4j_hed_data: Dict[str, Any],
         # No HED data available - optionally record this
         return
     
-    # Add timestamp
-    timestamp = datetime.utcnow().isoformat()
-    
-    await neo4j_client.run("""
-    // Find existing ingredient by inci name (case-insensitive)
-    MATCH (i:Ingredient)
-    WHERE toLower(i.inci) = toLower($inci_name)
-    
-    // Create/Update HED Assessment node (unique per ingredient)
-    MERGE (h:HEDAssessment {ingredient_key: i.key})
-    SET h.dtxsid = $dtxsid,
-        h.hed_mg_kg = $hed_mg_kg,
-        h.total_safe_dose_mg = $total_safe_dose_mg,
-        h.calculation_method = $calculation_method,
-        h.source_toxicity_type = $source_toxicity_type,
-        h.source_animal_species = $source_animal_species,
-        h.source_route = $source_route,
-        h.source_effect = $source_effect,
-        h.source_value_mg_kg = $source_value_mg_kg,
-        h.safe_concentration_percent = $safe_concentration_percent,
-        h.max_dermal_application_mg = $max_dermal_application_mg,
-        h.safety_factor = $safety_factor,
-        h.risk_assessment = $risk_assessment,
-        h.recommendation = $recommendation,
-        h.total_hed_calculations = $total_hed_calculations,
-        h.relevant_entries = $relevant_entries,
-        h.last_updated = $timestamp
-    
-    // Link ingredient to HED assessment
-    MERGE (i)-[:HAS_HED_ASSESSMENT]->(h)
-    
-    // Create/Link to Risk Assessment effect
-    WITH i, h, $risk_assessment AS risk_level
-    MERGE (e:Effect {name: 'hed_safety_threshold'})
-    SET e.description = 'Human Equivalent Dose safety threshold from animal toxicology'
-    MERGE (h)-[:ASSESSED_AS {level: risk_level}]->(e)
-    """, {
-        "inci_name": inci_name,
-        "dtxsid": neo4j_hed_data.get("dtxsid"),
-        "hed_mg_kg": neo4j_hed_data.get("hed_mg_kg"),
-        "total_safe_dose_mg": neo4j_hed_data.get("total_safe_dose_mg"),
-        "calculation_method": neo4j_hed_data.get("calculation_method"),
-        "source_toxicity_type": neo4j_hed_data.get("source_toxicity_type"),
-        "source_animal_species": neo4j_hed_data.get("source_animal_species"),
-        "source_route": neo4j_hed_data.get("source_route"),
-        "source_effect": neo4j_hed_data.get("source_effect"),
-        "source_value_mg_kg": neo4j_hed_data.get("source_value_mg_kg"),
-        "safe_concentration_percent": neo4j_hed_data.get("safe_concentration_percent"),
-        "max_dermal_application_mg": neo4j_hed_data.get("max_dermal_application_mg"),
-        "safety_factor": neo4j_hed_data.get("safety_factor"),
-        "risk_assessment": neo4j_hed_data.get("risk_assessment"),
-        "recommendation": neo4j_hed_data.get("recommendation"),
-        "total_hed_calculations": neo4j_hed_data.get("total_hed_calculations"),
-        "relevant_entries": neo4j_hed_data.get("relevant_entries"),
-        "timestamp": timestamp,
+    await neo4j_client.run(_HED_UPSERT, {
+        "rows": [_hed_row(inci_name, neo4j_hed_data)],
+        "timestamp": datetime.utcnow().isoformat(),
     })
 
 
@@ -244,6 +245,41 @@ async def upsert_ingredient_with_hed(result: ChemicalIdentityResult, neo4j_hed_d
     if neo4j_hed_data and neo4j_hed_data.get("hed_available"):
         await upsert_hed_assessment(result.inci_name, neo4j_hed_data)
 
+async def upsert_ingredients_with_hed_batch(
+    pairs: List[Tuple[ChemicalIdentityResult, Optional[Dict[str, Any]]]]
+):
+    """
+    Batch variant of upsert_ingredient_with_hed.
+    
+    Writes all ingredients, their hazards and HED assessments with one UNWIND
+    statement each, in a single transaction.
+    
+    Args:
+        pairs: (ChemicalIdentityResult, optional HED data) tuples
+    """
+    ingredient_rows = []
+    hazard_rows = []
+    hed_rows = []
+    for result, neo4j_hed_data in pairs:
+        if not result or not result.found or not result.comprehensive_data:
+            continue
+        ingredient, hazards = _identity_rows(result)
+        ingredient_rows.append(ingredient)
+        if hazards:
+            hazard_rows.append(hazards)
+        if neo4j_hed_data and neo4j_hed_data.get("hed_available"):
+            hed_rows.append(_hed_row(result.inci_name, neo4j_hed_data))
+    
+    if not ingredient_rows:
+        return
+    
+    statements = [(_INGREDIENT_UPSERT, {"rows": ingredient_rows})]
+    if hazard_rows:
+        statements.append((_HAZARD_UPSERT, {"rows": hazard_rows}))
+    if hed_rows:
+        statements.append((_HED_UPSERT, {"rows": hed_rows, "timestamp": datetime.utcnow().isoformat()}))
+    await neo4j_client.run_many(statements)
+
 async def upsert_user_profile(user_email: str, conditions: List[str] = None, profile_data: dict = None):
     """
     Upsert user profile to Neo4j with comprehensive data.
@@ -0,0 +1,239 @@
+"""
+OCR engine wrapper.
+
+OCR runs on a small dedicated thread pool. Each pool thread lazily creates its
+own Tesseract API handle (tesserocr), so the eng+pol language models are loaded
+once per thread instead of on every request (as happens when shelling out to the
+tesseract binary). Handles are never shared between threads, and tesserocr
+releases the GIL while recognizing, so concurrent uploads scale across cores.
+``decode_image`` is CPU-bound on large photos as well and should be called from
+a worker thread (e.g. ``asyncio.to_thread``).
+
+Request handlers should go through ``recognize``: once ``start_worker`` has
+been called on startup, concurrent uploads are queued and drained in batches
+by a background task that hands each batch to the OCR pool.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple, Union
+
+import cv2
+import numpy as np
+from tesserocr import PyTessBaseAPI, OEM, PSM
+
+logger = logging.getLogger(__name__)
+
+OCR_LANG = "eng+pol"
+# Long-edge cap in pixels; phone photos (~4000px) are far above what Tesseract needs
+OCR_MAX_EDGE = 1600
+# Maximum number of queued images handed to Tesseract in one worker pass
+OCR_BATCH_SIZE = 8
+# Number of OCR threads (each holds its own Tesseract handle)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+_local = threading.local()
+# Every handle ever created, so close() can release them from the main thread
+_apis: List[PyTessBaseAPI] = []
+_apis_lock = threading.Lock()
+
+_queue: Optional["asyncio.Queue[Tuple[np.ndarray, asyncio.Future]]"] = None
+_worker: Optional[asyncio.Task] = None
+_in_flight: Optional[asyncio.Semaphore] = None
+# Batches handed to the pool and not finished yet
+_busy = 0
+_dispatching: Set[asyncio.Task] = set()
+
+
+def _get_api() -> PyTessBaseAPI:
+    """Return the calling thread's Tesseract handle, creating it on first use."""
+    api = getattr(_local, "api", None)
+    if api is None:
+        logger.info(f"Initializing Tesseract API (lang={OCR_LANG}) in {threading.current_thread().name}")
+        api = PyTessBaseAPI(lang=OCR_LANG, psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+        _local.api = api
+        with _apis_lock:
+            _apis.append(api)
+    return api
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    Decode raw upload bytes straight to a grayscale image.
+
+    Args:
+        data: Encoded image (JPEG, PNG, ...)
+
+    Returns:
+        Single-channel image
+
+    Raises:
+        ValueError: If the bytes are not a decodable image
+    """
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        raise ValueError("Nie udało się zdekodować obrazu")
+    return img
+
+
+def preprocess(img: np.ndarray) -> np.ndarray:
+    """Downscale so the long edge is at most OCR_MAX_EDGE and convert to grayscale."""
+    height, width = img.shape[:2]
+    scale = OCR_MAX_EDGE / max(height, width)
+    if scale < 1.0:
+        img = cv2.resize(img, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return np.ascontiguousarray(img)
+
+
+def image_to_text(img: np.ndarray) -> str:
+    """
+    Run OCR on a decoded OpenCV image using the calling thread's handle.
+
+    Args:
+        img: Image as returned by cv2 (BGR or single-channel grayscale)
+
+    Returns:
+        Recognized text
+    """
+    img = preprocess(img)
+    height, width = img.shape
+    api = _get_api()
+    api.SetImageBytes(img.tobytes(), width, height, 1, width)
+    return api.GetUTF8Text()
+
+
+def _run_batch(images: List[np.ndarray]) -> List[Union[str, Exception]]:
+    """OCR a batch on one pool thread; failures are returned per image."""
+    results: List[Union[str, Exception]] = []
+    for img in images:
+        try:
+            results.append(image_to_text(img))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _warm_up(barrier: threading.Barrier):
+    """Load the language data on one pool thread, then hold it so the next job lands on another."""
+    _get_api()
+    barrier.wait(timeout=60)
+
+
+async def warm_up():
+    """Create a Tesseract handle on every pool thread before the first real request."""
+    loop = asyncio.get_running_loop()
+    barrier = threading.Barrier(OCR_WORKERS)
+    await asyncio.gather(*(loop.run_in_executor(_pool, _warm_up, barrier) for _ in range(OCR_WORKERS)))
+
+
+async def _dispatch(batch: List[Tuple[np.ndarray, asyncio.Future]], in_flight: asyncio.Semaphore):
+    """Run one batch on the OCR pool and resolve its futures."""
+    global _busy
+    try:
+        results = await asyncio.get_running_loop().run_in_executor(
+            _pool, _run_batch, [img for img, _ in batch]
+        )
+    except Exception as e:
+        results = [e] * len(batch)
+    finally:
+        _busy -= 1
+        in_flight.release()
+
+    for (_, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+async def _worker_loop():
+    """Drain the queue in batches of up to OCR_BATCH_SIZE images, one batch per free OCR thread."""
+    global _busy
+    while True:
+        await _in_flight.acquire()
+        batch = [await _queue.get()]
+        # Spread what is queued over every idle thread instead of piling it onto this one
+        size = min(OCR_BATCH_SIZE, math.ceil((1 + _queue.qsize()) / (OCR_WORKERS - _busy)))
+        while len(batch) < size:
+            batch.append(_queue.get_nowait())
+
+        # Same-sized images back to back let Tesseract reuse its page buffers
+        batch.sort(key=lambda item: item[0].shape)
+        logger.debug(f"OCR worker dispatching batch of {len(batch)}")
+        _busy += 1
+        task = asyncio.create_task(_dispatch(batch, _in_flight))
+        _dispatching.add(task)
+        task.add_done_callback(_dispatching.discard)
+
+
+def start_worker():
+    """Start the batching OCR worker (called on application startup)."""
+    global _queue, _worker, _in_flight
+    if _worker is None:
+        _queue = asyncio.Queue()
+        _in_flight = asyncio.Semaphore(OCR_WORKERS)
+        _worker = asyncio.create_task(_worker_loop())
+
+
+async def stop_worker():
+    """
+    Cancel the batching OCR worker (called on application shutdown).
+
+    Batches already on the pool are finished; requests still queued fail
+    instead of waiting forever for a worker that is gone.
+    """
+    global _queue, _worker, _in_flight
+    if _worker is None:
+        return
+    _worker.cancel()
+    try:
+        await _worker
+    except asyncio.CancelledError:
+        pass
+    await asyncio.gather(*_dispatching, return_exceptions=True)
+    while not _queue.empty():
+        _, future = _queue.get_nowait()
+        if not future.done():
+            future.set_exception(RuntimeError("Usługa OCR jest zamykana"))
+    _worker = None
+    _queue = None
+    _in_flight = None
+
+
+async def recognize(img: np.ndarray) -> str:
+    """
+    OCR an image without blocking the event loop.
+
+    Goes through the batching worker when it is running and straight to the OCR
+    pool otherwise (e.g. in scripts and tests).
+
+    Args:
+        img: Decoded image
+
+    Returns:
+        Recognized text
+    """
+    if _worker is None:
+        return await asyncio.get_running_loop().run_in_executor(_pool, image_to_text, img)
+
+    future = asyncio.get_running_loop().create_future()
+    await _queue.put((img, future))
+    return await future
+
+
+def close():
+    """Stop the OCR pool and release all Tesseract handles (called on application shutdown)."""
+    _pool.shutdown(wait=True)
+    with _apis_lock:
+        for api in _apis:
+            api.End()
+        _apis.clear()
@@ -1,17 +1,147 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, func, literal, null, union_all
 from sqlalchemy.sql import text
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 import logging
+import os
 from ..models.toxval_models import Chemical, MvToxValDB, Toxval, MvSkinEye, MvCancerSummary, Species
+from ..utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# CAS -> chemical dict (or None when ToxVal has no such CAS); the mapping doesn't change between snapshots
+chemical_cache = LRUCache(maxsize=4096, ttl=int(os.getenv("TOXVAL_CACHE_TTL", "3600")))
+
+# Output field -> column for each per-DTXSID lookup. Shared by the single-table
+# getters and by get_bundle, which fetches all four in one statement.
+_SKIN_EYE_COLUMNS = {
+    "endpoint": MvSkinEye.endpoint,
+    "classification": MvSkinEye.classification,
+    "result_text": MvSkinEye.result_text,
+    "score": MvSkinEye.score,
+    "species": MvSkinEye.species,
+    "source": MvSkinEye.source,
+}
+_CANCER_COLUMNS = {
+    "source": MvCancerSummary.source,
+    "exposure_route": MvCancerSummary.exposure_route,
+    "cancer_call": MvCancerSummary.cancer_call,
+    "source_url": MvCancerSummary.source_url,
+}
+_DERMAL_COLUMNS = {
+    "toxval_type": Toxval.toxval_type,
+    "toxval_numeric": Toxval.toxval_numeric,
+    "toxval_units": Toxval.toxval_units,
+    "toxicological_effect": Toxval.toxicological_effect,
+    "exposure_route": Toxval.exposure_route,
+    "species": Toxval.species_original,
+    "source": Toxval.source,
+}
+class ToxValDBRow(NamedTuple):
+    """One ToxValDB record; a tuple is much lighter than a dict for the large ToxValDB result sets."""
+    toxval_type: Optional[str] = None
+    toxval_numeric: Optional[float] = None
+    toxval_units: Optional[str] = None
+    risk_assessment_class: Optional[str] = None
+    human_eco: Optional[str] = None
+    study_type: Optional[str] = None
+    species_common: Optional[str] = None
+    exposure_route: Optional[str] = None
+    toxicological_effect: Optional[str] = None
+    source: Optional[str] = None
+    qc_category: Optional[str] = None
+
+# Keys must stay in ToxValDBRow field order
+_TOXVALDB_COLUMNS = {
+    "toxval_type": MvToxValDB.toxval_type,
+    "toxval_numeric": MvToxValDB.toxval_numeric,
+    "toxval_units": MvToxValDB.toxval_units,
+    "risk_assessment_class": MvToxValDB.risk_assessment_class,
+    "human_eco": MvToxValDB.human_eco,
+    "study_type": MvToxValDB.study_type,
+    "species_common": MvToxValDB.species_common,
+    "exposure_route": MvToxValDB.exposure_route,
+    "toxicological_effect": MvToxValDB.toxicological_effect,
+    "source": MvToxValDB.source,
+    "qc_category": MvToxValDB.qc_category,
+}
+_DERMAL_ROUTE = or_(
+    Toxval.exposure_route.like('%Dermal%'),
+    Toxval.exposure_route.like('%Cutaneous%'),
+    Toxval.exposure_route_original.like('%Dermal%'),
+    Toxval.exposure_route_original.like('%Cutaneous%'),
+)
+
+# Bundle-only filters mirroring what ToxValScraper's extractors look at (LIKE is case-insensitive in MySQL)
+_BUNDLE_SKIN_EYE_RELEVANT = or_(
+    MvSkinEye.endpoint.like('%irritation%'),
+    MvSkinEye.endpoint.like('%sensitisation%'),
+    MvSkinEye.endpoint.like('%sensitization%'),
+    MvSkinEye.classification.like('%skin sens%'),
+    MvSkinEye.result_text.like('%allerg%'),
+)
+_BUNDLE_TOXVALDB_RELEVANT = or_(
+    MvToxValDB.toxval_numeric.isnot(None),
+    MvToxValDB.toxicological_effect.isnot(None),
+    MvToxValDB.toxval_type.like('%NOAEL%'),
+    MvToxValDB.toxval_type.like('%NOEL%'),
+)
+
+_BUNDLE_PARTS = {
+    "skin_eye": _SKIN_EYE_COLUMNS,
+    "cancer": _CANCER_COLUMNS,
+    "dermal": _DERMAL_COLUMNS,
+    "toxvaldb": _TOXVALDB_COLUMNS,
+}
+_BUNDLE_DTXSID = {
+    "skin_eye": MvSkinEye.dtxsid,
+    "cancer": MvCancerSummary.dtxsid,
+    "dermal": Toxval.dtxsid,
+    "toxvaldb": MvToxValDB.dtxsid,
+}
+_BUNDLE_FILTERS = {
+    "skin_eye": _BUNDLE_SKIN_EYE_RELEVANT,
+    "dermal": _DERMAL_ROUTE & Toxval.toxval_type.like('%NOAEL%'),
+    "toxvaldb": _BUNDLE_TOXVALDB_RELEVANT,
+}
+# Parts of which only the first row is read
+_BUNDLE_FIRST_ONLY = {"cancer", "dermal"}
+# Every field of every part; each UNION ALL branch pads the ones it lacks with NULL
+_BUNDLE_FIELDS = list(dict.fromkeys(field for columns in _BUNDLE_PARTS.values() for field in columns))
+
+Bundle = Tuple[List[Dict], List[Dict], List[Dict], List[ToxValDBRow]]
+
+
+def _labeled(columns: Dict[str, Any]) -> List[Any]:
+    return [column.label(field) for field, column in columns.items()]
+
+
+def _bundle_branch(kind: str, dtxsids: List[str]) -> Any:
+    columns = _BUNDLE_PARTS[kind]
+    dtxsid_column = _BUNDLE_DTXSID[kind]
+    query = select(
+        literal(kind).label("kind"),
+        dtxsid_column.label("dtxsid"),
+        *[(columns[field] if field in columns else null()).label(field) for field in _BUNDLE_FIELDS]
+    )
+    if len(dtxsids) == 1:
+        query = query.where(dtxsid_column == dtxsids[0])
+        if kind in _BUNDLE_FIRST_ONLY:
+            query = query.limit(1)
+    else:
+        query = query.where(dtxsid_column.in_(dtxsids))
+    if kind in _BUNDLE_FILTERS:
+        query = query.where(_BUNDLE_FILTERS[kind])
+    return query
+
 class ToxValService:
     """Service for retrieving data from the ToxVal database."""
     
     async def find_chemical_by_cas(self, db: AsyncSession, cas_number: str) -> Optional[Dict]:
         """Wyszukiwanie składnika po numerze CAS."""
+        if cas_number in chemical_cache:
+            return chemical_cache.get(cas_number)
+        
         logger.info(f"Searching ToxVal for CAS: {cas_number}")
         query = select(Chemical).where(Chemical.casrn == cas_number)
         result = await db.execute(query)
@@ -19,123 +149,203 @@ class ToxValService:
         
         if chemical:
             logger.info(f"Found chemical in ToxVal: {chemical.dtxsid} - {chemical.name}")
-            return {
+            found = {
                 "dtxsid": chemical.dtxsid,
                 "casrn": chemical.casrn,
                 "name": chemical.name
             }
+            chemical_cache.set(cas_number, found)
+            return found
         logger.warning(f"No chemical found in ToxVal for CAS: {cas_number}")
+        chemical_cache.set(cas_number, None)
         return None
     
+    async def find_chemical_by_name(self, db: AsyncSession, name: str, limit: int = 10) -> List[Dict]:
+        """
+        Wyszukiwanie składnika po nazwie.
+        
+        Tries an exact (case-insensitive under MySQL's default collation) match
+        first, which is a seek on ix_chemical_name; only when that finds nothing
+        does it fall back to a prefix match, which can still use the index.
+        
+        Args:
+            name: Ingredient name
+            limit: Maximum number of prefix matches returned
+            
+        Returns:
+            Matching chemicals, exact matches first
+        """
+        name = name.strip()
+        if not name:
+            return []
+        
+        logger.info(f"Searching ToxVal for name: {name}")
+        columns = (Chemical.dtxsid, Chemical.casrn, Chemical.name)
+        result = await db.execute(select(*columns).where(Chemical.name == name).limit(1))
+        chemicals = [dict(row._mapping) for row in result]
+        
+        if not chemicals:
+            result = await db.execute(
+                select(*columns)
+                .where(Chemical.name.startswith(name, autoescape=True))
+                .order_by(func.length(Chemical.name))
+                .limit(limit)
+            )
+            chemicals = [dict(row._mapping) for row in result]
+        
+        logger.info(f"Found {len(chemicals)} chemicals in ToxVal for name: {name}")
+        return chemicals
+    
+    async def find_chemicals_by_cas(self, db: AsyncSession, cas_numbers: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Look up several CAS numbers with a single ``IN`` query.
+        
+        Results (including misses) go through the same cache as ``find_chemical_by_cas``.
+        
+        Args:
+            cas_numbers: CAS numbers to look up
+            
+        Returns:
+            Dictionary mapping each CAS number to its chemical dict, or None if not in ToxVal
+        """
+        found: Dict[str, Optional[Dict]] = {}
+        misses: List[str] = []
+        for cas_number in dict.fromkeys(cas_numbers):
+            if cas_number in chemical_cache:
+                found[cas_number] = chemical_cache.get(cas_number)
+            else:
+                misses.append(cas_number)
+        
+        if misses:
+            logger.info(f"Searching ToxVal for {len(misses)} CAS numbers")
+            result = await db.execute(select(Chemical).where(Chemical.casrn.in_(misses)))
+            rows: Dict[str, Dict] = {}
+            for chemical in result.scalars():
+                rows.setdefault(chemical.casrn, {
+                    "dtxsid": chemical.dtxsid,
+                    "casrn": chemical.casrn,
+                    "name": chemical.name
+                })
+            for cas_number in misses:
+                chemical = rows.get(cas_number)
+                chemical_cache.set(cas_number, chemical)
+                found[cas_number] = chemical
+            logger.info(f"Found {len(rows)} of {len(misses)} CAS numbers in ToxVal")
+        
+        return found
+    
     async def get_skin_eye_data(self, db: AsyncSession, dtxsid: str) -> List[Dict]:
         """Retrieve data on the effects on skin and eyes for the substance."""
         logger.info(f"Fetching skin/eye data for DTXSID: {dtxsid}")
-        query = select(MvSkinEye).where(MvSkinEye.dtxsid == dtxsid)
+        query = select(*_labeled(_SKIN_EYE_COLUMNS)).where(MvSkinEye.dtxsid == dtxsid)
         result = await db.execute(query)
-        data = result.scalars().all()
-        
-        skin_eye_data = [
-            {
-                "endpoint": item.endpoint,
-                "classification": item.classification,
-                "result_text": item.result_text,
-                "score": item.score,
-                "species": item.species,
-                "source": item.source
-            } 
-            for item in data
-        ]
+        
+        skin_eye_data = [dict(row._mapping) for row in result]
         
         logger.info(f"Found {len(skin_eye_data)} skin/eye records for {dtxsid}")
-        logger.debug(f"Skin/eye data: {skin_eye_data[:5]}{'...' if len(skin_eye_data) > 5 else ''}")
+        logger.debug("Skin/eye data: %s%s", skin_eye_data[:5], '...' if len(skin_eye_data) > 5 else '')
         return skin_eye_data
     
     async def get_cancer_data(self, db: AsyncSession, dtxsid: str) -> List[Dict]:
         """Retrieve data on the carcinogenic potential of the substance."""
         logger.info(f"Fetching cancer data for DTXSID: {dtxsid}")
-        query = select(MvCancerSummary).where(MvCancerSummary.dtxsid == dtxsid)
+        query = select(*_labeled(_CANCER_COLUMNS)).where(MvCancerSummary.dtxsid == dtxsid)
         result = await db.execute(query)
-        data = result.scalars().all()
-        
-        cancer_data = [
-            {
-                "source": item.source,
-                "exposure_route": item.exposure_route,
-                "cancer_call": item.cancer_call,
-                "source_url": item.source_url
-            } 
-            for item in data
-        ]
+        
+        cancer_data = [dict(row._mapping) for row in result]
         
         logger.info(f"Found {len(cancer_data)} cancer records for {dtxsid}")
-        logger.debug(f"Cancer data: {cancer_data}")
+        logger.debug("Cancer data: %s", cancer_data)
         return cancer_data
     
     async def get_dermal_toxicity(self, db: AsyncSession, dtxsid: str) -> List[Dict]:
         """Retrieve data on dermal toxicity."""
         logger.info(f"Fetching dermal toxicity for DTXSID: {dtxsid}")
-        query = select(Toxval).where(
-            Toxval.dtxsid == dtxsid,
-            or_(Toxval.exposure_route.like('%Dermal%'), 
-                Toxval.exposure_route.like('%Cutaneous%'),
-                Toxval.exposure_route_original.like('%Dermal%'),
-                Toxval.exposure_route_original.like('%Cutaneous%'))
-        )
+        query = select(*_labeled(_DERMAL_COLUMNS)).where(Toxval.dtxsid == dtxsid, _DERMAL_ROUTE)
         result = await db.execute(query)
-        data = result.scalars().all()
-        
-        toxicity_data = [
-            {
-                "toxval_type": item.toxval_type,
-                "toxval_numeric": item.toxval_numeric,
-                "toxval_units": item.toxval_units,
-                "toxicological_effect": item.toxicological_effect,
-                "exposure_route": item.exposure_route,
-                "species": item.species_original,
-                "source": item.source
-            }
-            for item in data
-        ]
+        
+        toxicity_data = [dict(row._mapping) for row in result]
         
         logger.info(f"Found {len(toxicity_data)} dermal toxicity records for {dtxsid}")
-        logger.debug(f"Sample toxicity data: {toxicity_data} .end.")
+        logger.debug("Sample toxicity data: %s .end.", toxicity_data)
         return toxicity_data
     
-    async def get_toxvaldb_data(self, db: AsyncSession, dtxsid: str = None, casrn: str = None) -> List[Dict]:
+    async def get_toxvaldb_data(self, db: AsyncSession, dtxsid: str = None, casrn: str = None) -> List[ToxValDBRow]:
         """Data from materialized view ToxValDB."""
         logger.info(f"Fetching ToxValDB data for DTXSID: {dtxsid} or CAS: {casrn}")
         
+        columns = _labeled(_TOXVALDB_COLUMNS)
         if dtxsid:
-            query = select(MvToxValDB).where(MvToxValDB.dtxsid == dtxsid)
+            query = select(*columns).where(MvToxValDB.dtxsid == dtxsid)
         elif casrn:
-            query = select(MvToxValDB).where(MvToxValDB.casrn == casrn)
+            query = select(*columns).where(MvToxValDB.casrn == casrn)
         else:
             return []
         
         result = await db.execute(query)
-        data = result.scalars().all()
-        
-        toxval_data = [
-            {
-                "toxval_type": item.toxval_type,
-                "toxval_numeric": item.toxval_numeric,
-                "toxval_units": item.toxval_units,
-                "risk_assessment_class": item.risk_assessment_class,
-                "human_eco": item.human_eco,
-                "study_type": item.study_type,
-                "species_common": item.species_common,
-                "exposure_route": item.exposure_route,
-                "toxicological_effect": item.toxicological_effect,
-                "source": item.source,
-                "qc_category": item.qc_category
-            }
-            for item in data
-        ]
+        toxval_data = [ToxValDBRow(*row) for row in result]
         
         logger.info(f"Found {len(toxval_data)} ToxValDB records")
-        logger.debug(f"Sample ToxValDB data: {toxval_data}")
+        logger.debug("Sample ToxValDB data: %s", toxval_data)
         return toxval_data
 
+    async def get_bundle(self, db: AsyncSession, dtxsid: str) -> Bundle:
+        """
+        Retrieve skin/eye, cancer, dermal toxicity and ToxValDB rows in one round trip.
+        
+        Returns:
+            Tuple of (skin_eye, cancer, dermal, toxvaldb) row lists
+        """
+        bundles = await self.get_bundles(db, [dtxsid])
+        return bundles.get(dtxsid, ([], [], [], []))
+
+    async def get_bundles(self, db: AsyncSession, dtxsids: List[str]) -> Dict[str, Bundle]:
+        """
+        Retrieve the toxicology bundles of several substances in one round trip.
+        
+        The four lookups are sent as a single UNION ALL tagged by source table;
+        rows are split back out per DTXSID with the same fields the single-table
+        getters return (ToxValDB rows as ``ToxValDBRow``). Only rows the
+        ToxValScraper extractors can use are transferred: skin/eye rows mentioning
+        irritation, sensitisation or allergy, cancer calls, dermal NOAELs and
+        ToxValDB rows carrying a value or effect.
+        
+        Args:
+            dtxsids: DSSTox substance IDs
+            
+        Returns:
+            Dictionary mapping each DTXSID to its (skin_eye, cancer, dermal, toxvaldb) row lists
+        """
+        dtxsids = list(dict.fromkeys(dtxsids))
+        if not dtxsids:
+            return {}
+        
+        logger.info(f"Fetching ToxVal bundle for {len(dtxsids)} DTXSID(s): {', '.join(dtxsids[:5])}{'...' if len(dtxsids) > 5 else ''}")
+        query = union_all(*(_bundle_branch(kind, dtxsids) for kind in _BUNDLE_PARTS))
+        result = await db.execute(query)
+        
+        bundles: Dict[str, Dict[str, List[Dict]]] = {dtxsid: {kind: [] for kind in _BUNDLE_PARTS} for dtxsid in dtxsids}
+        for row in result:
+            mapping = row._mapping
+            bundle = bundles.get(mapping["dtxsid"])
+            if bundle is None:
+                continue
+            kind = mapping["kind"]
+            if kind == "toxvaldb":
+                bundle[kind].append(ToxValDBRow(*(mapping[field] for field in _TOXVALDB_COLUMNS)))
+            else:
+                bundle[kind].append({field: mapping[field] for field in _BUNDLE_PARTS[kind]})
+        
+        for dtxsid, bundle in bundles.items():
+            logger.info(
+                f"Found {len(bundle['skin_eye'])} skin/eye, {len(bundle['cancer'])} cancer, "
+                f"{len(bundle['dermal'])} dermal and {len(bundle['toxvaldb'])} ToxValDB records for {dtxsid}"
+            )
+        return {
+            dtxsid: (bundle["skin_eye"], bundle["cancer"], bundle["dermal"], bundle["toxvaldb"])
+            for dtxsid, bundle in bundles.items()
+        }
+
     async def get_complete_toxval_data(self, db: AsyncSession, cas_number: str) -> Dict[str, Any]:
         """Retrieve all toxicological data for a substance by CAS number."""
         logger.info(f"Getting complete ToxVal data for CAS: {cas_number}")
@@ -0,0 +1,68 @@
+"""
+Bulkhead for outbound API calls.
+
+Caps how many calls to one upstream are in flight at once. The rate limiter
+bounds how often calls start; this bounds how many are outstanding, so a
+slow or overloaded upstream cannot pile up requests (and the 503-triggered
+retries that follow) faster than it answers them. Like ``RateLimiter`` it
+holds no loop-bound state between calls, so a single instance can be shared
+across event loops (e.g. between test cases).
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque
+
+
+class Bulkhead:
+    """At most ``max_concurrent`` holders at a time; the rest wait in FIFO order."""
+
+    def __init__(self, max_concurrent: int):
+        """
+        Args:
+            max_concurrent: Calls allowed in flight at once
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        self.max_concurrent = max_concurrent
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        while self._in_flight >= self.max_concurrent:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next()  # woken then cancelled: pass the free slot on
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """Give a slot back and wake the longest waiter."""
+        self._in_flight -= 1
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+                return
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return None
@@ -0,0 +1,67 @@
+"""
+Circuit breaker for outbound API calls.
+
+After ``fail_threshold`` consecutive failed calls the circuit opens and callers
+are refused immediately instead of paying for timeouts and retries against an
+upstream that is down. Once ``recovery_timeout`` seconds have passed a single
+probe call is let through (half-open); its outcome closes the circuit again or
+re-opens it for another ``recovery_timeout``; a probe that never reports back
+(e.g. its caller was cancelled) is given up on after ``recovery_timeout`` and
+another probe is let through. Only failures that say something
+about the upstream's health (5xx, throttling, timeouts, connection errors)
+should be recorded as failures - a 404 is a healthy answer. Like
+``RateLimiter`` it holds no asyncio primitives.
+"""
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """CLOSED -> OPEN after repeated failures, HALF_OPEN probe after a cool-down."""
+
+    def __init__(self, fail_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            fail_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before letting a probe through
+        """
+        self.fail_threshold = fail_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CLOSED
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go out now; moves OPEN to HALF_OPEN after the cool-down."""
+        if self._state == CLOSED:
+            return True
+        now = time.monotonic()
+        if self._state != CLOSED and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._opened_at = now  # a new probe window, in case this probe never reports back
+            return True  # this caller is the probe
+        return False
+
+    def record_success(self) -> None:
+        """The upstream answered; close the circuit."""
+        self._failures = 0
+        self._state = CLOSED
+
+    def record_failure(self) -> None:
+        """The upstream failed; open the circuit on a failed probe or too many failures in a row."""
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.fail_threshold:
+            self._state = OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,52 @@
+"""
+Token-bucket rate limiter for outbound API calls.
+
+Allows bursts of up to ``max_rate`` calls and refills continuously at
+``max_rate`` tokens per ``time_period`` seconds, so callers run concurrently
+until the upstream's real limit is reached instead of queueing one by one.
+Holds no asyncio primitives, so a single instance can be shared across event
+loops (e.g. between test cases).
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """At most ``max_rate`` acquisitions per ``time_period`` seconds."""
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """
+        Args:
+            max_rate: Bucket capacity and number of tokens added per period
+            time_period: Length of the refill period in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.max_rate, self._tokens + elapsed * self.max_rate / self.time_period)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until ``tokens`` are available and take them."""
+        if tokens > self.max_rate:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.max_rate}")
+
+        while True:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
@@ -1,14 +1,19 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import auth, user, product,  toxval 
+import os
 import time
 import logging
 
 from app.core import neo4j_client
+from app.core.database import ensure_indexes
+from app.core.mysql_database import engine as mysql_engine, warm_up_pool
 from app.core.neo4j_client import ensure_constraints
+from app.scrapers.base_scraper import close_session
+from app.service import ocr_service
 
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(levelname)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
@@ -19,10 +24,27 @@ app = FastAPI()
 @app.on_event("startup")
 async def startup_event():
     try:
+        await neo4j_client.neo4j_client.verify_connectivity()
         await ensure_constraints()
         logger.info("Neo4j constraints ensured")
     except Exception as e:
         logger.error(f"Neo4j init failed: {e}")
+    try:
+        await ensure_indexes()
+        logger.info("MongoDB indexes ensured")
+    except Exception as e:
+        logger.error(f"MongoDB index init failed: {e}")
+    try:
+        await warm_up_pool()
+        logger.info(f"MySQL connection pool warmed up: {mysql_engine.pool.status()}")
+    except Exception as e:
+        logger.warning(f"MySQL pool warm-up failed: {e}")
+    try:
+        await ocr_service.warm_up()
+        logger.info("OCR workers warmed up")
+    except Exception as e:
+        logger.warning(f"OCR warm-up failed: {e}")
+    ocr_service.start_worker()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -31,6 +53,11 @@ async def shutdown_event():
         logger.info("Neo4j driver closed")
     except Exception as e:
         logger.warning(f"Neo4j close failed: {e}")
+    await product.chemical_mapper.close()
+    await close_session()
+    await mysql_engine.dispose()
+    await ocr_service.stop_worker()
+    ocr_service.close()
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -0,0 +1,42 @@
+import time
+import pytest
+from app.models.chemical_identity import (
+    BasicChemicalIdentifiers, ToxicologyData, ComprehensiveChemicalData, ChemicalIdentityResult
+)
+
+class TestChemicalIdentityModels:
+
+    def test_last_updated_is_set_per_instance(self):
+        first = ComprehensiveChemicalData(inci_name="aqua")
+        time.sleep(0.001)
+        second = ComprehensiveChemicalData(inci_name="aqua")
+        
+        assert second.last_updated > first.last_updated
+
+    def test_list_defaults_are_not_shared(self):
+        first = ChemicalIdentityResult(inci_name="aqua")
+        second = ChemicalIdentityResult(inci_name="glycerin")
+        
+        first.errors.append("basic: timeout")
+        first.sources_checked.append("pubchem")
+        
+        assert second.errors == []
+        assert second.sources_checked == []
+
+    def test_calculate_completeness(self):
+        data = ComprehensiveChemicalData(
+            inci_name="glycerin",
+            basic_identifiers=BasicChemicalIdentifiers(inci_name="glycerin", source="pubchem", confidence_score=0.8),
+            toxicology=ToxicologyData(source="toxval", confidence_score=0.6),
+        )
+        data.calculate_completeness()
+        
+        assert data.data_completeness == 50.0
+        assert data.total_confidence == pytest.approx(0.7)
+
+    def test_calculate_completeness_no_domains(self):
+        data = ComprehensiveChemicalData(inci_name="unknown")
+        data.calculate_completeness()
+        
+        assert data.data_completeness == 0.0
+        assert data.total_confidence == 0.0
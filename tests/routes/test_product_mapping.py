@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.models.chemical_identity import ChemicalIdentityResult
+from app.routes import product
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failing", ["upsert_ingredients_with_hed_batch", "neo4j_client.run", None])
+async def test_failed_ingredient_writes_are_not_cacheable(failing):
+    """A product whose ingredient writes failed must not be served from the product cache."""
+    results = [ChemicalIdentityResult(inci_name="Aqua", found=False)]
+    upsert = AsyncMock(side_effect=Exception("neo4j down") if failing == "upsert_ingredients_with_hed_batch" else None)
+    run = AsyncMock(side_effect=Exception("neo4j down") if failing == "neo4j_client.run" else None)
+
+    with patch.object(product.chemical_mapper, "map_ingredients_batch", AsyncMock(return_value=results)), \
+         patch.object(product, "upsert_ingredients_with_hed_batch", upsert), \
+         patch.object(product.neo4j_client, "run", run):
+        ing_keys, info, cacheable = await product._map_and_store_ingredients(["Aqua"], 60.0)
+
+    assert ing_keys == ["inci:aqua"]
+    assert info["results"][0]["inci_name"] == "Aqua"
+    assert cacheable is (failing is None)
+
+
+def test_create_info_lists_sources_in_first_seen_order():
+    from app.models.chemical_identity import ComprehensiveChemicalData
+    results = [
+        ChemicalIdentityResult(inci_name=name, found=True,
+                               comprehensive_data=ComprehensiveChemicalData(inci_name=name, sources_used=sources))
+        for name, sources in (("Aqua", ["pubchem"]), ("Glycerin", ["pubchem", "toxval"]), ("Parfum", ["toxval"]))
+    ]
+
+    info = product._create_info(results, ["Aqua", "Glycerin", "Parfum"])
+
+    assert info["comprehensive_summary"]["sources_used"] == ["pubchem", "toxval"]
+
+
+@pytest.mark.asyncio
+async def test_product_mapped_during_outage_is_not_cacheable():
+    """Scraper failures reach result.errors, so an outage is never cached as "no data"."""
+    mapper = product.chemical_mapper
+    scraper = type(mapper.basic_scrapers[0][1])  # batches open their own instances
+    outage = {"source": "pubchem", "found": False, "error": "PubChem circuit open"}
+
+    with patch.object(mapper, "store", None), \
+         patch.object(mapper, "toxicology_scrapers", []), \
+         patch.object(scraper, "search_by_names", AsyncMock(return_value={"Glycerin": outage})), \
+         patch.object(scraper, "search_by_name", AsyncMock(return_value=outage)), \
+         patch.object(product, "upsert_ingredients_with_hed_batch", AsyncMock()), \
+         patch.object(product.neo4j_client, "run", AsyncMock()):
+        _, info, cacheable = await product._map_and_store_ingredients(["Glycerin"], 60.0)
+
+    assert info["results"][0]["errors"] == ["basic: pubchem: PubChem circuit open"]
+    assert cacheable is False
+    assert mapper._get_cached("Glycerin") is None
@@ -58,14 +58,20 @@ def mock_mongodb(monkeypatch):
             return True
         return False
     
-    async def mock_find_one(query):
+    async def mock_find_one(query, projection=None):
         email = query.get("email")
         if email == test_user["email"]:
             return {**test_user, **stored_profile}
         return None
     
+    async def mock_find_one_and_update(query, update_data, projection=None, return_document=None):
+        if await mock_update_one(query, update_data):
+            return await mock_find_one(query)
+        return None
+    
     from app.core.database import users_collection
     monkeypatch.setattr(users_collection, "update_one", mock_update_one)
+    monkeypatch.setattr(users_collection, "find_one_and_update", mock_find_one_and_update)
     monkeypatch.setattr(users_collection, "find_one", mock_find_one)
 
 def test_update_and_get_user_profile(mock_current_user, mock_mongodb):
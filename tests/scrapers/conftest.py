@@ -5,6 +5,20 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from app.scrapers.base_scraper import _breakers, _bulkheads, scrape_cache
+from app.scrapers.toxval_scraper import toxicity_cache
+from app.service.toxval_service import chemical_cache
+
+@pytest.fixture(autouse=True)
+def clear_scrape_cache():
+    """Scrape results are cached process-wide; start every test cold."""
+    caches = (scrape_cache, toxicity_cache, chemical_cache, _breakers, _bulkheads)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
 @pytest.fixture
 def sample_inci_ingredients():
     """Common INCI ingredients for testing."""
@@ -1,6 +1,9 @@
+import asyncio
+import time
+import aiohttp
 import pytest
-from unittest.mock import AsyncMock, patch
-import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.scrapers.base_scraper import ScrapeError
 from app.scrapers.pubchem_scraper import PubChemScraper
 
 class TestPubChemScraper:
@@ -55,13 +58,9 @@ class TestPubChemScraper:
         """Test successful search by ingredient name."""
         with patch.object(scraper, '_make_request') as mock_request:
             mock_responses = [
-                AsyncMock(json=lambda: mock_cid_response),  # CID call
-                AsyncMock(json=lambda: {"PropertyTable": {"Properties": [{"MolecularFormula": "C3H8O3"}]}}),
-                AsyncMock(json=lambda: {"PropertyTable": {"Properties": [{"MolecularWeight": "92.09"}]}}),
-                AsyncMock(json=lambda: {"PropertyTable": {"Properties": [{"CanonicalSMILES": "C(C(CO)O)O"}]}}),
-                AsyncMock(json=lambda: {"PropertyTable": {"Properties": [{"InChI": "InChI=1S/C3H8O3/c4-1-3(6)2-5/h3-6H,1-2H2"}]}}),
-                AsyncMock(json=lambda: {"PropertyTable": {"Properties": [{"InChIKey": "PEDCQBHIVMGVHV-UHFFFAOYSA-N"}]}}),
-                AsyncMock(json=lambda: mock_synonyms_response)  # Synonyms call
+                mock_cid_response,  # CID call
+                mock_properties_response,  # All properties in one call
+                mock_synonyms_response  # Synonyms call
             ]
             mock_request.side_effect = mock_responses
             
@@ -75,6 +74,150 @@ class TestPubChemScraper:
             assert result["inchi"] == "InChI=1S/C3H8O3/c4-1-3(6)2-5/h3-6H,1-2H2"
             assert result["molecular_formula"] == "C3H8O3"
             assert result["confidence_score"] == 0.8
+            assert mock_request.call_count == 3
+            assert "/property/MolecularFormula,MolecularWeight,CanonicalSMILES,InChI,InChIKey/JSON" in mock_request.call_args_list[1].args[0]
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_quotes_name(self, scraper):
+        """Test that the compound name is URL-encoded in the CID lookup."""
+        with patch.object(scraper, '_make_request') as mock_request:
+            mock_request.return_value = {"IdentifierList": {"CID": []}}
+            
+            await scraper.search_by_name("sodium laureth/sulfate 2")
+            
+            assert "/compound/name/sodium%20laureth%2Fsulfate%202/cids/JSON" in mock_request.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_uses_cache(self, scraper):
+        """Test that a repeated lookup is served from the scrape cache."""
+        with patch.object(scraper, '_make_request') as mock_request:
+            mock_request.return_value = {"IdentifierList": {"CID": []}}
+            
+            first = await scraper.search_by_name("Glycerin")
+            second = await PubChemScraper().search_by_name(" glycerin ")
+            
+            assert first == second
+            assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_are_coalesced(self, scraper):
+        """Test that concurrent lookups of the same name share one request."""
+        async def slow_response(url):
+            await asyncio.sleep(0.01)
+            return {"IdentifierList": {"CID": []}}
+        
+        with patch.object(scraper, '_make_request', AsyncMock(side_effect=slow_response)) as mock_request:
+            results = await asyncio.gather(*(scraper.search_by_name("Glycerin") for _ in range(5)))
+            
+            assert mock_request.call_count == 1
+            assert all(result == results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_fail_followers(self, scraper):
+        """Test that a lookup waiting on a cancelled one runs the lookup itself."""
+        async def slow_response(url):
+            await asyncio.sleep(0.05)
+            return {"IdentifierList": {"CID": []}}
+        
+        with patch.object(scraper, '_make_request', AsyncMock(side_effect=slow_response)) as mock_request:
+            leader = asyncio.ensure_future(scraper.search_by_name("Glycerin"))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(scraper.search_by_name("Glycerin"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            
+            result = await follower
+            
+            assert leader.cancelled()
+            assert result["found"] is False
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_errors_not_cached(self, scraper):
+        """Test that failed lookups are retried instead of cached."""
+        with patch.object(scraper, '_make_request') as mock_request:
+            mock_request.side_effect = Exception("Network timeout")
+            
+            await scraper.search_by_name("glycerin")
+            await scraper.search_by_name("glycerin")
+            
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_make_request_retries_transient_errors(self, scraper):
+        """Test that 503s are retried, honoring Retry-After."""
+        throttled = aiohttp.ClientResponseError(MagicMock(), (), status=503, headers={"Retry-After": "2"})
+        with patch.object(scraper, '_send', AsyncMock(side_effect=[throttled, {"ok": True}])) as mock_send, \
+             patch('asyncio.sleep', AsyncMock()) as mock_sleep:
+            
+            result = await scraper._make_request("https://example.org")
+            
+            assert result == {"ok": True}
+            assert mock_send.call_count == 2
+            mock_sleep.assert_awaited_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_make_request_does_not_retry_client_errors(self, scraper):
+        """Test that 4xx responses other than 429 fail immediately."""
+        not_found = aiohttp.ClientResponseError(MagicMock(), (), status=404)
+        with patch.object(scraper, '_send', AsyncMock(side_effect=not_found)) as mock_send:
+            
+            result = await scraper._make_request("https://example.org")
+            
+            assert isinstance(result, ScrapeError)
+            assert result.status == 404
+            assert mock_send.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_upstream_error(self, scraper):
+        """Test that a failed request degrades to an uncached error result."""
+        with patch.object(scraper, '_make_request', AsyncMock(return_value=ScrapeError(503, "External API unavailable"))):
+            
+            result = await scraper.search_by_name("glycerin")
+            
+            assert result["found"] is False
+            assert result["error"] == "External API unavailable"
+
+    @pytest.mark.asyncio
+    async def test_failed_detail_request_is_not_cached(self, scraper, mock_synonyms_response):
+        """Test that a failed property or synonyms request gives an uncached error, not a partial result."""
+        async def fake_request(url):
+            if "/compound/name/" in url:
+                return {"IdentifierList": {"CID": [753]}}
+            if "/synonyms/" in url:
+                return ScrapeError(503, "External API unavailable")
+            return {"PropertyTable": {"Properties": [{"CID": 753, "CanonicalSMILES": "C(C(CO)O)O"}]}}
+        
+        with patch.object(scraper, '_make_request', AsyncMock(side_effect=fake_request)) as mock_request:
+            single = await scraper.search_by_name("glycerin")
+            batch = await scraper.search_by_names(["glycerin"])
+            
+            assert single["error"] == "External API unavailable"
+            assert batch["glycerin"]["error"] == "External API unavailable"
+            assert mock_request.call_count == 6  # nothing was cached: 3 + 3 requests
+
+    @pytest.mark.asyncio
+    async def test_search_by_names_batches_cid_lookups(self, scraper, mock_synonyms_response):
+        """Test that properties and synonyms for all names come from one request each."""
+        async def fake_request(url):
+            if "/compound/name/glycerin/" in url:
+                return {"IdentifierList": {"CID": [753]}}
+            if "/compound/name/" in url:
+                return {"IdentifierList": {"CID": []}}
+            if "/property/" in url:
+                return {"PropertyTable": {"Properties": [{"CID": 753, "CanonicalSMILES": "C(C(CO)O)O"}]}}
+            return mock_synonyms_response
+        
+        with patch.object(scraper, '_make_request', AsyncMock(side_effect=fake_request)) as mock_request:
+            results = await scraper.search_by_names(["glycerin", "unknown-ingredient"])
+            cached = await scraper.search_by_name("glycerin")
+            
+            assert results["glycerin"]["found"] is True
+            assert results["glycerin"]["cas_number"] == "56-81-5"
+            assert results["glycerin"]["smiles"] == "C(C(CO)O)O"
+            assert results["unknown-ingredient"]["found"] is False
+            assert cached == results["glycerin"]
+            assert mock_request.call_count == 4  # 2 CID lookups + 1 property + 1 synonyms
 
     @pytest.mark.asyncio
     async def test_search_by_name_no_cid_found(self, scraper):
@@ -82,7 +225,7 @@ class TestPubChemScraper:
         mock_response = {"Fault": {"Code": "PUGREST.NotFound"}}
         
         with patch.object(scraper, '_make_request') as mock_request:
-            mock_request.return_value = AsyncMock(json=lambda: mock_response)
+            mock_request.return_value = mock_response
             
             result = await scraper.search_by_name("unknown-ingredient")
             
@@ -96,7 +239,7 @@ class TestPubChemScraper:
         mock_response = {"IdentifierList": {"CID": []}}
         
         with patch.object(scraper, '_make_request') as mock_request:
-            mock_request.return_value = AsyncMock(json=lambda: mock_response)
+            mock_request.return_value = mock_response
             
             result = await scraper.search_by_name("unknown-ingredient")
             
@@ -180,9 +323,68 @@ class TestPubChemScraper:
         import time
         
         with patch.object(scraper, '_make_request') as mock_request:
-            mock_request.return_value = AsyncMock(json=lambda: {"IdentifierList": {"CID": []}})
+            mock_request.return_value = {"IdentifierList": {"CID": []}}
             
             start_time = time.time()
             await scraper.search_by_name("test1")
             await scraper.search_by_name("test2")
             end_time = time.time()
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_after_repeated_failures(self, scraper):
+        """Once the upstream keeps failing, requests fail fast without being sent."""
+        scraper.max_retries = 0
+        scraper.breaker.fail_threshold = 2
+        down = aiohttp.ClientResponseError(MagicMock(), (), status=503)
+        with patch.object(scraper, '_send', AsyncMock(side_effect=down)) as mock_send:
+            for _ in range(3):
+                result = await scraper._make_request("https://example.org")
+                assert isinstance(result, ScrapeError) and result.status == 503
+            
+            assert mock_send.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_does_not_wedge_circuit(self, scraper):
+        """A half-open probe that is cancelled counts as a failure instead of blocking the circuit for good."""
+        scraper.max_retries = 0
+        scraper.breaker.fail_threshold = 1
+        scraper.breaker.recovery_timeout = 0.01
+        down = aiohttp.ClientResponseError(MagicMock(), (), status=503)
+        with patch.object(scraper, '_send', AsyncMock(side_effect=down)):
+            await scraper._make_request("https://example.org")
+        await asyncio.sleep(0.02)
+        
+        async def hang(*args):
+            await asyncio.sleep(10)
+        
+        with patch.object(scraper, '_send', AsyncMock(side_effect=hang)):
+            probe = asyncio.ensure_future(scraper._make_request("https://example.org"))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+        
+        assert scraper.breaker.state == "open"
+        await asyncio.sleep(0.02)
+        with patch.object(scraper, '_send', AsyncMock(return_value={})):
+            assert await scraper._make_request("https://example.org") == {}
+        assert scraper.breaker.state == "closed"
+
+    def test_unreported_probe_is_given_up_after_recovery_timeout(self):
+        from app.utils.circuit_breaker import CircuitBreaker
+        breaker = CircuitBreaker(fail_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow_request()      # the probe, which never reports back
+        assert not breaker.allow_request()
+        time.sleep(0.02)
+        assert breaker.allow_request()      # a fresh probe
+
+    @pytest.mark.asyncio
+    async def test_not_found_does_not_trip_circuit(self, scraper):
+        scraper.breaker.fail_threshold = 1
+        missing = aiohttp.ClientResponseError(MagicMock(), (), status=404)
+        with patch.object(scraper, '_send', AsyncMock(side_effect=missing)) as mock_send:
+            await scraper._make_request("https://example.org")
+            await scraper._make_request("https://example.org")
+            
+            assert mock_send.call_count == 2
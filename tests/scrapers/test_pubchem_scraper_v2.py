@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pubchempy as pcp
+
+from app.scrapers.pubchem_scraper_v2 import PubChemScraperV2
+
+
+class TestPubChemScraperV2:
+
+    @pytest.fixture
+    def scraper(self):
+        return PubChemScraperV2()
+
+    @pytest.mark.asyncio
+    async def test_call_retries_transient_errors(self, scraper):
+        """ServerBusy from PubChem is retried after a backoff."""
+        func = MagicMock(__name__="get_cids", side_effect=[pcp.ServerBusyError(503, "Server Busy", []), [962]])
+        with patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+            result = await scraper._call(func, "water", "name")
+
+        assert result == [962]
+        assert func.call_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_call_does_not_retry_not_found(self, scraper):
+        func = MagicMock(__name__="get_cids", side_effect=pcp.NotFoundError(404, "Not Found", []))
+        with patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+            with pytest.raises(pcp.NotFoundError):
+                await scraper._call(func, "unknown-xyz", "name")
+
+        assert func.call_count == 1
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_call_times_out_stalled_requests(self, scraper):
+        """A hung request counts as transient and gives up after max_retries."""
+        scraper.max_retries = 1
+        func = MagicMock(__name__="get_cids", return_value=[962])
+        with patch("app.scrapers.pubchem_scraper_v2.asyncio.wait_for", AsyncMock(side_effect=TimeoutError)), \
+             patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+            with pytest.raises(TimeoutError):
+                await scraper._call(func, "water", "name")
+
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_call_fails_fast_when_circuit_open(self, scraper):
+        from app.utils.circuit_breaker import CircuitOpenError
+        scraper.breaker.record_failure()
+        scraper.breaker.fail_threshold = 1
+        scraper.breaker.record_failure()
+        func = MagicMock(__name__="get_cids", return_value=[962])
+
+        with pytest.raises(CircuitOpenError):
+            await scraper._call(func, "water", "name")
+        func.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_call_caps_requests_in_flight():
+    """No more than the bulkhead's limit of pubchempy calls run at once."""
+    import asyncio
+    import threading
+    import time
+
+    scraper = PubChemScraperV2()
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def slow_call(name):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return name
+
+    results = await asyncio.gather(*(scraper._call(slow_call, str(i)) for i in range(8)))
+
+    assert results == [str(i) for i in range(8)]
+    assert peak <= scraper.bulkhead.max_concurrent == 5
+    assert scraper.bulkhead.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_call_unexpected_error_counts_as_failure():
+    """Errors other than PubChem's own HTTP answers are reported to the breaker."""
+    scraper = PubChemScraperV2()
+    scraper.breaker.fail_threshold = 1
+
+    def broken(name):
+        raise ValueError("unexpected payload")
+
+    with pytest.raises(ValueError):
+        await scraper._call(broken, "glycerin")
+
+    assert scraper.breaker.state == "open"
+
+
+def test_pubchempy_requests_have_socket_timeout():
+    """pubchempy's own requests time out, so a hung call does not hold a pool thread forever."""
+    from app.scrapers.pubchem_scraper_v2 import PUBCHEM_TIMEOUT
+
+    with patch("app.scrapers.pubchem_scraper_v2.urlopen") as mock_urlopen:
+        pcp.request("glycerin", "name", operation="cids")
+
+    assert mock_urlopen.call_args.kwargs["timeout"] == PUBCHEM_TIMEOUT
@@ -0,0 +1,202 @@
+import pytest
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+from app.scrapers.toxval_scraper import ToxValScraper
+from app.service.toxval_service import ToxValDBRow, ToxValService
+
+
+SKIN_EYE = [{"endpoint": "Skin irritation", "classification": None, "result_text": "mild", "score": None, "species": None, "source": "ECHA"}]
+TOXVALDB = [ToxValDBRow(toxval_type="NOAEL", toxval_numeric=1000.0, toxval_units="mg/kg-day",
+                        toxicological_effect="none", exposure_route="oral", human_eco="human health")]
+
+
+def _scraper():
+    scraper = ToxValScraper()
+    scraper.service = MagicMock()
+    scraper.service.find_chemical_by_cas = AsyncMock(return_value={"dtxsid": "DTXSID123", "casrn": "56-81-5", "name": "Glycerin"})
+    scraper.service.get_bundle = AsyncMock(side_effect=lambda db, dtxsid: ([dict(row) for row in SKIN_EYE], [], [], list(TOXVALDB)))
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_bundle_is_cached_per_dtxsid():
+    """A repeated lookup for the same substance skips the bundle query."""
+    scraper = _scraper()
+
+    first = await scraper.search_by_cas("56-81-5")
+    second = await scraper.search_by_cas("56-81-5")
+
+    assert first == second
+    assert first["irritation_potential"] == "mild"
+    assert first["noael_value"] == 1000.0
+    assert scraper.service.get_bundle.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_a_copy():
+    scraper = _scraper()
+
+    first = await scraper.search_by_cas("56-81-5")
+    first["inci_name"] = "Glycerin"
+    second = await scraper.search_by_cas("56-81-5")
+
+    assert "inci_name" not in second
+
+
+@pytest.mark.asyncio
+async def test_find_chemical_by_cas_caches_hits_and_misses():
+    service = ToxValService()
+    chemical = MagicMock(dtxsid="DTXSID123", casrn="56-81-5", name="Glycerin")
+    hit, miss = MagicMock(), MagicMock()
+    hit.scalars.return_value.first.return_value = chemical
+    miss.scalars.return_value.first.return_value = None
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[hit, miss])
+
+    assert (await service.find_chemical_by_cas(db, "56-81-5"))["dtxsid"] == "DTXSID123"
+    assert (await service.find_chemical_by_cas(db, "56-81-5"))["dtxsid"] == "DTXSID123"
+    assert await service.find_chemical_by_cas(db, "0-00-0") is None
+    assert await service.find_chemical_by_cas(db, "0-00-0") is None
+    assert db.execute.await_count == 2
+
+
+def test_extract_all_toxvaldb_single_pass():
+    rows = [
+        ToxValDBRow(toxval_type="LD50", toxval_numeric=5000.0, toxval_units="mg/kg", human_eco="human health"),
+        ToxValDBRow(toxval_type="NOEL", toxval_numeric=200.0, toxval_units="mg/kg-day", toxicological_effect="liver",
+                    exposure_route="oral", human_eco="human health"),
+        ToxValDBRow(toxval_type="DNEL", toxval_numeric=10.0, toxval_units="mg/kg-day", toxicological_effect="liver",
+                    exposure_route="dermal", human_eco="human health"),
+        ToxValDBRow(toxval_type="other", toxval_numeric=3.0, toxicological_effect="Skin absorption",
+                    exposure_route="Dermal", human_eco="eco"),
+    ]
+
+    extracted = ToxValScraper()._extract_all_toxvaldb(rows)
+
+    assert extracted["noael"] == 200.0
+    assert len(extracted["values"]) == 4
+    assert extracted["effects"] == ["liver", "Skin absorption"]
+    assert extracted["safe_concentration"] == "10.0 mg/kg-day (DNEL)"
+    assert extracted["dermal_absorption"] == "3.0% absorption"
+
+
+def test_extract_all_toxvaldb_empty():
+    assert ToxValScraper()._extract_all_toxvaldb([]) == {
+        "noael": None, "values": None, "effects": None, "safe_concentration": None, "dermal_absorption": None
+    }
+
+
+def test_extract_allergen_status():
+    scraper = ToxValScraper()
+    rows = [
+        {"classification": None, "result_text": "Not Sensitising", "_endpoint_lc": "skin sensitization"},
+        {"classification": "Skin Sens. 1", "result_text": None, "_endpoint_lc": "other"},
+    ]
+    assert scraper._extract_allergen_status(rows) == "Not sensitizing"
+    assert scraper._extract_allergen_status(rows[1:]) == "Skin Sens. 1"
+    assert scraper._extract_allergen_status([{"classification": None, "result_text": "Known Allergen", "_endpoint_lc": ""}]) == "Known Allergen"
+    assert scraper._extract_allergen_status([{"classification": None, "result_text": None, "_endpoint_lc": ""}]) is None
+
+
+@pytest.mark.asyncio
+async def test_search_by_cas_numbers_bulk_fills_cache():
+    """Bulk lookup issues one chemical and one bundle query, then search_by_cas is served from cache."""
+    scraper = _scraper()
+    scraper.service.find_chemicals_by_cas = AsyncMock(return_value={
+        "56-81-5": {"dtxsid": "DTXSID123", "casrn": "56-81-5", "name": "Glycerin"},
+        "0-00-0": None,
+    })
+    scraper.service.get_bundles = AsyncMock(return_value={
+        "DTXSID123": ([dict(row) for row in SKIN_EYE], [], [], list(TOXVALDB)),
+    })
+
+    results = await scraper.search_by_cas_numbers(["56-81-5", "0-00-0"])
+
+    assert results["56-81-5"]["noael_value"] == 1000.0
+    assert results["0-00-0"] == {"found": False}
+    scraper.service.get_bundles.assert_awaited_once_with(ANY, ["DTXSID123"])
+
+    assert (await scraper.search_by_cas("56-81-5")) == results["56-81-5"]
+    scraper.service.get_bundle.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_find_chemical_by_name_prefers_exact_match():
+    service = ToxValService()
+    exact = MagicMock()
+    exact.__iter__.return_value = iter([MagicMock(_mapping={"dtxsid": "DTXSID123", "casrn": "56-81-5", "name": "Glycerin"})])
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=exact)
+
+    chemicals = await service.find_chemical_by_name(db, " Glycerin ")
+
+    assert chemicals == [{"dtxsid": "DTXSID123", "casrn": "56-81-5", "name": "Glycerin"}]
+    assert db.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_find_chemical_by_name_falls_back_to_prefix():
+    service = ToxValService()
+    empty, prefix = MagicMock(), MagicMock()
+    empty.__iter__.return_value = iter([])
+    prefix.__iter__.return_value = iter([MagicMock(_mapping={"dtxsid": "DTXSID9", "casrn": "1-1-1", "name": "Glycerin 99%"})])
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[empty, prefix])
+
+    chemicals = await service.find_chemical_by_name(db, "Glycerin")
+
+    assert [c["dtxsid"] for c in chemicals] == ["DTXSID9"]
+    assert "LIKE" in str(db.execute.await_args_list[1].args[0])
+
+
+@pytest.mark.asyncio
+async def test_lookup_uses_one_off_session():
+    """Each query borrows a pooled session and releases it."""
+    scraper = _scraper()
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("app.scrapers.toxval_scraper.async_session", return_value=session):
+        result = await scraper.search_by_cas("56-81-5")
+
+    assert result["noael_value"] == 1000.0
+    scraper.service.find_chemical_by_cas.assert_awaited_once_with(session, "56-81-5")
+    assert session.__aexit__.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_lookups_run_concurrently():
+    """Lookups through one (batch-scoped) scraper each get their own session instead of queueing on one."""
+    import asyncio
+    scraper = _scraper()
+    both_started = asyncio.Event()
+    sessions = []
+
+    async def find(db, cas_number):
+        sessions.append(db)
+        if len(sessions) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), 1)
+        return None
+
+    scraper.service.find_chemical_by_cas = AsyncMock(side_effect=find)
+    with patch("app.scrapers.toxval_scraper.async_session", side_effect=lambda: MagicMock(
+            __aenter__=AsyncMock(side_effect=lambda: MagicMock()), __aexit__=AsyncMock(return_value=None))):
+        async with scraper:
+            results = await asyncio.gather(scraper.search_by_cas("56-81-5"), scraper.search_by_cas("7732-18-5"))
+
+    assert [r.get("error") for r in results] == [None, None]
+    assert sessions[0] is not sessions[1]
+
+
+@pytest.mark.asyncio
+async def test_db_failure_is_reported_as_error():
+    """A ToxVal DB failure is not a clean "not found"."""
+    scraper = _scraper()
+    scraper.service.find_chemical_by_cas = AsyncMock(side_effect=Exception("MySQL server has gone away"))
+
+    result = await scraper.search_by_cas("56-81-5")
+
+    assert result["found"] is False
+    assert "gone away" in result["error"]
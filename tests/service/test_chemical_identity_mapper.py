@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.service.chemical_identity_mapper import ChemicalIdentityMapper
 from app.models.chemical_identity import ChemicalIdentityResult
 
@@ -13,8 +13,8 @@ class TestChemicalIdentityMapper:
     def mock_pubchem_responses_aqua(self):
         """Mock HTTP responses for aqua from PubChem API."""
         return [
-            AsyncMock(json=lambda: {"IdentifierList": {"CID": [962]}}),
-            AsyncMock(json=lambda: {
+            {"IdentifierList": {"CID": [962]}},
+            {
                 "PropertyTable": {
                     "Properties": [{
                         "CanonicalSMILES": "O",
@@ -24,22 +24,22 @@ class TestChemicalIdentityMapper:
                         "MolecularWeight": "18.015"
                     }]
                 }
-            }),
-            AsyncMock(json=lambda: {
+            },
+            {
                 "InformationList": {
                     "Information": [{
                         "Synonym": ["water", "aqua", "7732-18-5", "H2O"]
                     }]
                 }
-            })
+            }
         ]
     
     @pytest.fixture
     def mock_pubchem_responses_glycerin(self):
         """Mock HTTP responses for glycerin from PubChem API."""
         return [
-            AsyncMock(json=lambda: {"IdentifierList": {"CID": [753]}}),
-            AsyncMock(json=lambda: {
+            {"IdentifierList": {"CID": [753]}},
+            {
                 "PropertyTable": {
                     "Properties": [{
                         "CanonicalSMILES": "C(C(CO)O)O",
@@ -49,33 +49,33 @@ class TestChemicalIdentityMapper:
                         "MolecularWeight": "92.09"
                     }]
                 }
-            }),
-            AsyncMock(json=lambda: {
+            },
+            {
                 "InformationList": {
                     "Information": [{
                         "Synonym": ["glycerol", "glycerin", "56-81-5", "1,2,3-propanetriol"]
                     }]
                 }
-            })
+            }
         ]
     
     @pytest.fixture
     def mock_pubchem_responses_generic(self):
         """Generic mock responses for batch testing."""
         return [
-            AsyncMock(json=lambda: {"IdentifierList": {"CID": [123]}}),
-            AsyncMock(json=lambda: {
+            {"IdentifierList": {"CID": [123]}},
+            {
                 "PropertyTable": {"Properties": [{"CanonicalSMILES": "CCO"}]}
-            }),
-            AsyncMock(json=lambda: {
+            },
+            {
                 "InformationList": {"Information": [{"Synonym": ["test", "123-45-6"]}]}
-            })
+            }
         ]
     
     @pytest.fixture
     def mock_pubchem_not_found(self):
         """Mock response when ingredient not found."""
-        return AsyncMock(json=lambda: {"Fault": {"Code": "PUGREST.NotFound"}})
+        return {"Fault": {"Code": "PUGREST.NotFound"}}
 
     @pytest.mark.asyncio
     async def test_map_ingredient_success_pubchem(self, mapper, mock_pubchem_responses_aqua):
@@ -168,7 +168,7 @@ class TestChemicalIdentityMapper:
 
     @pytest.mark.asyncio
     async def test_map_ingredients_batch_with_batching(self, mapper, mock_pubchem_responses_generic):
-        """Test batch processing with sleep between batches."""
+        """Batches don't pause between ingredients or between sources."""
         ingredients = [f"ingredient_{i}" for i in range(7)]
         
         all_responses = mock_pubchem_responses_generic * len(ingredients) * 2
@@ -182,28 +182,28 @@ class TestChemicalIdentityMapper:
             
             assert len(results) == 7
             for call in mock_sleep.call_args_list:
-                assert call[0][0] == 0.1
+                assert call[0][0] not in (0.1, 2.0)
 
     @pytest.mark.asyncio
     async def test_map_ingredient_pubchem_partial_data(self, mapper):
         """Test mapping with partial PubChem data."""
         
         partial_responses = [
-            AsyncMock(json=lambda: {"IdentifierList": {"CID": [123]}}),
-            AsyncMock(json=lambda: {
+            {"IdentifierList": {"CID": [123]}},
+            {
                 "PropertyTable": {
                     "Properties": [{
                         "CanonicalSMILES": "CCO"
                     }]
                 }
-            }),
-            AsyncMock(json=lambda: {
+            },
+            {
                 "InformationList": {
                     "Information": [{
                         "Synonym": ["ethanol", "123-45-6"]
                     }]
                 }
-            })
+            }
         ]
         
         all_responses = partial_responses * 2
@@ -216,4 +216,269 @@ class TestChemicalIdentityMapper:
             assert result.found is True
             assert result.identifiers.cas_number == "123-45-6"
             assert result.identifiers.smiles == "CCO"
-            
\ No newline at end of file
+            
+    @pytest.mark.asyncio
+    async def test_map_ingredient_uses_cache(self, mapper):
+        """Repeated lookups of the same (normalized) INCI name hit the cache."""
+        found = ChemicalIdentityResult(inci_name="aqua", found=True)
+        
+        with patch.object(mapper, "_map_ingredient_uncached", AsyncMock(return_value=found)) as mock_map:
+            first = await mapper.map_ingredient("aqua")
+            second = await mapper.map_ingredient(" Aqua ")
+            
+            assert mock_map.await_count == 1
+            assert first.found and second.found
+            assert second.inci_name == " Aqua "
+
+    @pytest.mark.asyncio
+    async def test_map_ingredient_does_not_cache_errors(self, mapper):
+        """Failed lookups with errors are retried instead of cached."""
+        failed = ChemicalIdentityResult(inci_name="test", found=False, errors=["timeout"])
+        
+        with patch.object(mapper, "_map_ingredient_uncached", AsyncMock(return_value=failed)) as mock_map:
+            await mapper.map_ingredient("test")
+            await mapper.map_ingredient("test")
+            
+            assert mock_map.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_map_ingredients_batch_deduplicates(self, mapper):
+        """Repeated ingredients are mapped once and the result is shared."""
+        async def fake_map(inci_name):
+            return ChemicalIdentityResult(inci_name=inci_name, found=False, errors=["timeout"])
+        
+        with patch.object(mapper, "_map_ingredient_uncached", AsyncMock(side_effect=fake_map)) as mock_map, \
+             patch.object(mapper, "_prefetch_basic_identifiers", AsyncMock()) as mock_prefetch, \
+             patch.object(mapper, "_prefetch_toxicology", AsyncMock()) as mock_tox_prefetch:
+            results = await mapper.map_ingredients_batch(["Aqua", "glycerin", "aqua "])
+            
+            assert mock_map.await_count == 2
+            mock_prefetch.assert_awaited_once_with(["Aqua", "glycerin"])
+            mock_tox_prefetch.assert_awaited_once_with(["Aqua", "glycerin"])
+            assert [r.inci_name for r in results] == ["Aqua", "glycerin", "aqua "]
+
+    @pytest.mark.asyncio
+    async def test_map_ingredients_batch_shares_scrapers(self, mapper):
+        """Every ingredient in a batch uses the same batch-scoped scraper instance."""
+        used = []
+        
+        class FakeScraper:
+            async def __aenter__(self):
+                return self
+            async def __aexit__(self, *exc):
+                return None
+            async def search_by_names(self, names):
+                return {}
+            async def search_by_name(self, name):
+                used.append(self)
+                return {"found": True, "cas_number": None, "smiles": name}
+        
+        registered = FakeScraper()
+        mapper.basic_scrapers = [("fake", registered)]
+        mapper.toxicology_scrapers = []
+        
+        results = await mapper.map_ingredients_batch(["aqua", "glycerin", "parfum"])
+        
+        assert len(used) == 3 and len(set(used)) == 1
+        assert used[0] is not registered
+        assert [r.inci_name for r in results] == ["aqua", "glycerin", "parfum"]
+
+    @pytest.mark.asyncio
+    async def test_map_ingredient_fetches_basic_identifiers_once(self, mapper):
+        """Toxicology reuses the CAS number from the basic lookup instead of repeating it."""
+        from app.models.chemical_identity import BasicChemicalIdentifiers
+        basic = BasicChemicalIdentifiers(inci_name="glycerin", cas_number="56-81-5", source="pubchem", confidence_score=0.8)
+        
+        class FakeToxVal:
+            async def __aenter__(self):
+                return self
+            async def __aexit__(self, *exc):
+                return None
+            async def search_by_cas(self, cas_number):
+                return {"found": True, "dtxsid": "DTXSID123", "confidence_score": 0.8}
+        
+        mapper.toxicology_scrapers = [("toxval", FakeToxVal())]
+        with patch.object(mapper, "_collect_basic_identifiers", AsyncMock(return_value=basic)) as mock_basic:
+            result = await mapper.map_ingredient("glycerin")
+            
+            assert mock_basic.await_count == 1
+            assert result.found
+            assert result.sources_checked == ["pubchem", "toxval"]
+
+    @pytest.mark.asyncio
+    async def test_map_ingredient_reads_through_store(self):
+        """Store hits skip scraping; fresh results without errors are written back."""
+        stored = ChemicalIdentityResult(inci_name="aqua", found=True)
+        store = AsyncMock()
+        store.get.side_effect = lambda key: stored if key == "aqua" else None
+        mapper = ChemicalIdentityMapper(store=store)
+        fresh = ChemicalIdentityResult(inci_name="glycerin", found=True)
+        
+        with patch.object(mapper, "_map_ingredient_uncached", AsyncMock(return_value=fresh)) as mock_map:
+            hit = await mapper.map_ingredient("Aqua")
+            miss = await mapper.map_ingredient("glycerin")
+            
+            assert hit.found and hit.inci_name == "Aqua"
+            assert miss is fresh
+            mock_map.assert_awaited_once_with("glycerin")
+            store.set.assert_awaited_once_with("glycerin", fresh)
+
+    @pytest.mark.asyncio
+    async def test_map_ingredients_batch_queries_store_once(self):
+        store = AsyncMock()
+        store.get_many.return_value = {"aqua": ChemicalIdentityResult(inci_name="aqua", found=True)}
+        store.get.return_value = None
+        mapper = ChemicalIdentityMapper(store=store)
+        
+        async def fake_map(inci_name):
+            return ChemicalIdentityResult(inci_name=inci_name, found=False)
+        
+        with patch.object(mapper, "_map_ingredient_uncached", AsyncMock(side_effect=fake_map)) as mock_map, \
+             patch.object(mapper, "_prefetch_basic_identifiers", AsyncMock()) as mock_prefetch, \
+             patch.object(mapper, "_prefetch_toxicology", AsyncMock()):
+            results = await mapper.map_ingredients_batch(["Aqua", "parfum"])
+            
+            store.get_many.assert_awaited_once_with(["aqua", "parfum"])
+            store.get.assert_not_awaited()
+            mock_prefetch.assert_awaited_once_with(["parfum"])
+            mock_map.assert_awaited_once_with("parfum")
+            assert [r.inci_name for r in results] == ["Aqua", "parfum"]
+            assert results[0].found
+
+    def test_map_ingredients_batch_works_across_event_loops(self):
+        """The module-level mapper outlives loops (tests, TestClient, reloads); its semaphore must not."""
+        import asyncio
+        
+        async def fake_map(inci_name):
+            await asyncio.sleep(0)
+            return ChemicalIdentityResult(inci_name=inci_name, found=True)
+        
+        with patch("app.service.chemical_identity_mapper.MAP_CONCURRENCY", 1):
+            mapper = ChemicalIdentityMapper()  # built outside any loop, like the routes' singleton
+        
+        with patch("app.service.chemical_identity_mapper.MAP_CONCURRENCY", 1), \
+             patch.object(mapper, "_map_ingredient_uncached", AsyncMock(side_effect=fake_map)), \
+             patch.object(mapper, "_prefetch", AsyncMock()):
+            first = asyncio.run(mapper.map_ingredients_batch(["aqua", "glycerin"]))
+            second = asyncio.run(mapper.map_ingredients_batch(["parfum", "limonene"]))
+        
+        assert all(r.found for r in first + second)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_cached_mapping(self):
+        store = AsyncMock()
+        store.get.return_value = None
+        mapper = ChemicalIdentityMapper(store=store)
+        
+        with patch.object(mapper, "_map_ingredient_uncached",
+                          AsyncMock(return_value=ChemicalIdentityResult(inci_name="aqua", found=True))) as mock_map:
+            await mapper.map_ingredient("aqua")
+            await mapper.invalidate("Aqua ")
+            await mapper.map_ingredient("aqua")
+            
+            assert mock_map.await_count == 2
+            store.invalidate.assert_awaited_once_with("aqua")
+
+    @pytest.mark.asyncio
+    async def test_map_ingredient_deadline_keeps_partial_results(self):
+        """A source that misses the deadline is dropped; finished sources are kept."""
+        import asyncio
+        from app.models.chemical_identity import BasicChemicalIdentifiers
+        mapper = ChemicalIdentityMapper(deadline=0.05)
+        basic = BasicChemicalIdentifiers(inci_name="aqua", cas_number="7732-18-5", source="pubchem", confidence_score=0.8)
+        
+        async def slow_toxicology(inci_name, basic_task=None):
+            await asyncio.sleep(10)
+        
+        with patch.object(mapper, "_collect_basic_identifiers", AsyncMock(return_value=basic)), \
+             patch.object(mapper, "_collect_toxicology_data", slow_toxicology):
+            result = await mapper.map_ingredient("aqua")
+            
+            assert result.found
+            assert result.comprehensive_data.basic_identifiers == basic
+            assert result.errors == ["toxicology: timeout"]
+
+    @pytest.mark.asyncio
+    async def test_map_ingredient_reuses_registered_scrapers(self, mapper):
+        """Single lookups use the scrapers built in __init__ instead of creating new ones."""
+        registered = mapper.basic_scrapers[0][1]
+        mapper.toxicology_scrapers = []
+        
+        with patch.object(registered, "search_by_name", AsyncMock(return_value={"found": False})) as mock_search:
+            await mapper.map_ingredient("aqua")
+            await mapper.map_ingredient("glycerin")
+            
+            assert mock_search.await_count == 2
+            assert mapper.basic_scrapers[0][1] is registered
+
+    @pytest.mark.asyncio
+    async def test_collect_basic_identifiers_matches_validated_model(self, mapper):
+        """The unvalidated fast path builds the same model validation would."""
+        from app.models.chemical_identity import BasicChemicalIdentifiers
+        data = {"found": True, "cas_number": "56-81-5", "smiles": "C(C(CO)O)O", "molecular_weight": 92.09,
+                "confidence_score": 0.8, "unrelated": "ignored"}
+        scraper = mapper.basic_scrapers[0][1]
+        
+        with patch.object(scraper, "search_by_name", AsyncMock(return_value=data)):
+            basic = await mapper._collect_basic_identifiers("glycerin")
+        
+        expected = BasicChemicalIdentifiers(inci_name="glycerin", cas_number="56-81-5", smiles="C(C(CO)O)O",
+                                            molecular_weight=92.09, source="pubchem", confidence_score=0.8)
+        assert basic.model_dump() == expected.model_dump()
+
+    @pytest.mark.asyncio
+    async def test_map_ingredients_batch_bounds_prefetch_by_deadline(self):
+        """A hung batch prefetch is dropped at the deadline instead of stalling the batch."""
+        import asyncio
+        import time
+        
+        class SlowBatchScraper:
+            async def __aenter__(self):
+                return self
+            async def __aexit__(self, *exc):
+                return None
+            async def search_by_names(self, names):
+                await asyncio.sleep(10)
+            async def search_by_name(self, name):
+                return {"found": True, "cas_number": None, "smiles": "O"}
+        
+        mapper = ChemicalIdentityMapper(deadline=0.2)
+        mapper.basic_scrapers = [("fake", SlowBatchScraper())]
+        mapper.toxicology_scrapers = []
+        
+        start = time.monotonic()
+        results = await mapper.map_ingredients_batch(["aqua"])
+        
+        assert time.monotonic() - start < 2
+        assert results[0].found
+
+    @pytest.mark.asyncio
+    async def test_store_failures_are_treated_as_misses(self):
+        """A MongoDB outage degrades the store instead of failing the lookup or invalidation."""
+        from app.service.chemical_mapping_store import ChemicalMappingStore
+        collection = AsyncMock()
+        collection.find = MagicMock(side_effect=Exception("mongo down"))
+        collection.delete_one.side_effect = Exception("mongo down")
+        mapper = ChemicalIdentityMapper(store=ChemicalMappingStore(collection))
+        
+        assert await mapper.store.get("aqua") is None
+        await mapper.invalidate("aqua")
+        collection.delete_one.assert_awaited_once_with({"_id": "aqua"})
+
+    @pytest.mark.asyncio
+    async def test_source_errors_are_reported_and_not_cached(self):
+        """An upstream outage is an error, not a "not found" answer to cache or persist."""
+        store = AsyncMock()
+        store.get.return_value = None
+        mapper = ChemicalIdentityMapper(store=store)
+        mapper.toxicology_scrapers = []
+        scraper = mapper.basic_scrapers[0][1]
+        outage = {"source": "pubchem", "found": False, "error": "PubChem circuit open"}
+        
+        with patch.object(scraper, "search_by_name", AsyncMock(return_value=outage)):
+            result = await mapper.map_ingredient("glycerin")
+        
+        assert not result.found
+        assert result.errors == ["basic: pubchem: PubChem circuit open"]
+        assert mapper._get_cached("glycerin") is None
+        store.set.assert_not_awaited()
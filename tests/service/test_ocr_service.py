@@ -0,0 +1,65 @@
+import asyncio
+import numpy as np
+import pytest
+from app.service import ocr_service
+
+
+class TestOcrService:
+
+    def test_preprocess_downscales_and_grays(self):
+        img = np.zeros((3000, 4000, 3), np.uint8)
+        result = ocr_service.preprocess(img)
+        assert result.shape == (1200, 1600)
+
+    def test_preprocess_keeps_small_images(self):
+        img = np.zeros((300, 400), np.uint8)
+        assert ocr_service.preprocess(img).shape == (300, 400)
+
+    def test_decode_image_invalid_bytes(self):
+        with pytest.raises(ValueError):
+            ocr_service.decode_image(b"not an image")
+
+    @pytest.mark.asyncio
+    async def test_recognize_batches_concurrent_requests(self, monkeypatch):
+        batches = []
+
+        def fake_run_batch(images):
+            batches.append(len(images))
+            return [f"text-{img.shape[0]}" for img in images]
+
+        monkeypatch.setattr(ocr_service, "_run_batch", fake_run_batch)
+        monkeypatch.setattr(ocr_service, "OCR_WORKERS", 4)
+        ocr_service.start_worker()
+        try:
+            images = [np.zeros((10 + i, 10), np.uint8) for i in range(8)]
+            results = await asyncio.gather(*(ocr_service.recognize(img) for img in images))
+        finally:
+            await ocr_service.stop_worker()
+
+        assert results == [f"text-{10 + i}" for i in range(8)]
+        # Queued images are batched, but spread over all four threads rather than one
+        assert batches == [2, 2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_recognize_propagates_errors(self, monkeypatch):
+        monkeypatch.setattr(ocr_service, "_run_batch", lambda images: [RuntimeError("boom")] * len(images))
+        ocr_service.start_worker()
+        try:
+            with pytest.raises(RuntimeError):
+                await ocr_service.recognize(np.zeros((10, 10), np.uint8))
+        finally:
+            await ocr_service.stop_worker()
+
+    @pytest.mark.asyncio
+    async def test_stop_worker_fails_queued_requests(self, monkeypatch):
+        monkeypatch.setattr(ocr_service, "_run_batch", lambda images: ["text"] * len(images))
+        monkeypatch.setattr(ocr_service, "OCR_WORKERS", 1)
+        ocr_service.start_worker()
+        await ocr_service._in_flight.acquire()  # the only OCR thread is busy, so requests stay queued
+        request = asyncio.create_task(ocr_service.recognize(np.zeros((10, 10), np.uint8)))
+        await asyncio.sleep(0)
+
+        await ocr_service.stop_worker()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(request, 1)